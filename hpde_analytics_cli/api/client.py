@@ -4,12 +4,39 @@ MotorsportsReg API client module.
 Provides a high-level interface for accessing MotorsportsReg API endpoints.
 """
 
+import functools
+import logging
+import random
+import threading
 import time
-from typing import Any, Dict, Optional
-
-from requests_oauthlib import OAuth1Session
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
 
 from hpde_analytics_cli.auth.oauth import MSROAuth
+from hpde_analytics_cli.utils import _loads
+
+if TYPE_CHECKING:
+    from requests_oauthlib import OAuth1Session
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _network_errors() -> Tuple[Type[Exception], ...]:
+    """
+    Transient network failures worth retrying.
+
+    requests is imported on first use, which is only ever while handling
+    an exception raised by a request it sent.
+    """
+    from requests import exceptions as requests_exceptions
+
+    return (
+        requests_exceptions.ConnectionError,
+        requests_exceptions.Timeout,
+        requests_exceptions.ChunkedEncodingError,
+    )
+
 
 # Error message constants
 ERR_EVENT_ID_REQUIRED = "Event ID is required"
@@ -30,6 +57,35 @@ class APIError(Exception):
 class MSRClient:
     """Client for interacting with MotorsportsReg API endpoints."""
 
+    # Endpoint paths (with .json suffix for JSON responses)
+    ME_PATH = "/rest/me.json"
+    CALENDAR_PATH = "/rest/calendars/organization/{org_id}.json"
+    ENTRYLIST_PATH = "/rest/events/{event_id}/entrylist.json"
+    ATTENDEES_PATH = "/rest/events/{event_id}/attendees.json"
+    ASSIGNMENTS_PATH = "/rest/events/{event_id}/assignments.json"
+    TIMING_FEED_PATH = "/rest/events/{event_id}/feeds/timing.json"
+
+    # Event endpoint key -> client method, for bulk fetches
+    EVENT_ENDPOINTS = {
+        "entrylist": "get_event_entrylist",
+        "attendees": "get_event_attendees",
+        "assignments": "get_event_assignments",
+        "timing": "get_timing_feed",
+    }
+
+    # Non-retryable status code -> error message template
+    _STATUS_ERRORS = {
+        401: "Authentication failed - tokens may be invalid or expired",
+        403: "Access forbidden - insufficient permissions",
+        404: "Resource not found: {endpoint}",
+    }
+
+    # HTTP method -> (session method name, keyword used to send params)
+    _VERB_TABLE = {
+        "GET": ("get", "params"),
+        "POST": ("post", "data"),
+    }
+
     def __init__(self, oauth: MSROAuth, organization_id: Optional[str] = None):
         """
         Initialize the API client.
@@ -44,27 +100,77 @@ class MSRClient:
 
         # Retry configuration
         self.max_retries = 3
-        self.retry_delay = 1.0  # seconds
+        self.retry_delay = 1.0  # seconds (base delay for exponential backoff)
+        self.max_retry_delay = 30.0  # seconds
+
+        # Maximum concurrent requests when fetching multiple endpoints
+        self.max_workers = 4
+
+        # Shared rate-limit gate: when any request is rate limited, new requests
+        # wait until this monotonic timestamp instead of piling on
+        self._backoff_until = 0.0
+        self._backoff_lock = threading.Lock()
+
+        # In-process TTL cache for idempotent GETs, keyed by request identity
+        self.cache_ttl: Dict[str, float] = {"me": 300.0, "calendar": 60.0}  # seconds
+        self._cache: Dict[Tuple, Tuple[float, bytes]] = {}
+
+        # Canonical URL per endpoint path
+        self._endpoint_cache: Dict[str, str] = {}
 
-    def _get_session(self) -> OAuth1Session:
-        """Get an authenticated OAuth session."""
+        # ETag validators for conditional GETs: request key -> (etag, response body)
+        self._etags: Dict[Tuple, Tuple[str, bytes]] = {}
+
+    @functools.cached_property
+    def default_org_id(self) -> Optional[str]:
+        """ID of the first organization on the authenticated profile, resolved once."""
+        if self.oauth.organizations:
+            return self.oauth.organizations[0].get("id")
+        return None
+
+    def _get_session(self) -> "OAuth1Session":
+        """
+        Get the authenticated OAuth session.
+
+        The session is owned by the OAuth handler, which reuses it for every
+        client built on that handler so urllib3 keeps the connection to the
+        API host alive between calls.
+        """
         return self.oauth.get_oauth_session()
 
-    def _execute_http_request(
-        self,
-        method: str,
-        session: OAuth1Session,
-        url: str,
-        params: Optional[Dict[str, Any]],
-        headers: Dict[str, str],
-    ):
-        """Execute HTTP request based on method type."""
-        if method.upper() == "GET":
-            return session.get(url, params=params, headers=headers)
-        elif method.upper() == "POST":
-            return session.post(url, data=params, headers=headers)
-        else:
-            raise APIError(f"Unsupported HTTP method: {method}")
+    def close(self) -> None:
+        """
+        Release what this client holds: its cached responses and ETag validators.
+
+        The OAuth session stays open for other clients on the same handler;
+        MSROAuth.close_session() closes it.
+        """
+        self.invalidate()
+
+    def __enter__(self) -> "MSRClient":
+        """Open the session up front so every call in the block reuses it."""
+        self._get_session()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Release the client's own state when the block ends."""
+        self.close()
+
+    def _parse_json(self, response) -> Any:
+        """
+        Parse a response body as JSON straight from its bytes.
+
+        Skips response.json(), which decodes to text first (with charset
+        detection when the server omits one).
+        """
+        return _loads(response.content)
+
+    @staticmethod
+    def _unwrap(data: Any) -> Any:
+        """Unwrap the MSR response envelope ({"response": {...}}) if present."""
+        if isinstance(data, dict) and "response" in data:
+            return data["response"]
+        return data
 
     def _handle_response_status(self, response, endpoint: str) -> Optional[Dict[str, Any]]:
         """
@@ -76,94 +182,163 @@ class MSRClient:
         Raises:
             APIError: For non-retryable errors
         """
-        if response.status_code == 200:
-            data = response.json()
-            # MSR wraps responses in {"response": {...}}
-            if isinstance(data, dict) and "response" in data:
-                data = data["response"]
-            return data
-
-        if response.status_code == 401:
-            raise APIError(
-                "Authentication failed - tokens may be invalid or expired",
-                status_code=401,
-                response_body=response.text,
-            )
-
-        if response.status_code == 403:
-            raise APIError(
-                "Access forbidden - insufficient permissions",
-                status_code=403,
-                response_body=response.text,
-            )
-
-        if response.status_code == 404:
-            raise APIError(
-                f"Resource not found: {endpoint}",
-                status_code=404,
-                response_body=response.text,
-            )
-
-        if response.status_code >= 500:
-            # Server error - signal retry
+        status_code = response.status_code
+        if status_code == 200:
+            try:
+                data = self._parse_json(response)
+            except ValueError as e:
+                raise APIError(
+                    f"Invalid JSON in response from {endpoint}",
+                    status_code=status_code,
+                    response_body=response.text,
+                ) from e
+            return self._unwrap(data)
+
+        if status_code == 429 or status_code >= 500:
+            # Rate limited or server error - signal retry
             return None
 
+        message = self._STATUS_ERRORS.get(status_code, "Request failed with status {status_code}")
         raise APIError(
-            f"Request failed with status {response.status_code}",
-            status_code=response.status_code,
+            message.format(endpoint=endpoint, status_code=status_code),
+            status_code=status_code,
             response_body=response.text,
         )
 
-    def _should_retry_on_server_error(
-        self, response, endpoint: str, attempt: int, retries: int
-    ) -> APIError:
+    def _get_retry_delay(self, attempt: int, response=None) -> float:
+        """
+        Compute how long to wait before the next retry attempt.
+
+        Honors a numeric Retry-After header when the server provides one,
+        otherwise uses exponential backoff with jitter so concurrent workers
+        don't retry in lockstep.
+
+        Args:
+            attempt: Current attempt number (0-based)
+            response: HTTP response object, if one was received
+
+        Returns:
+            Delay in seconds
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), self.max_retry_delay)
+            except (TypeError, ValueError):
+                pass  # HTTP-date form - fall back to backoff
+
+        ceiling = min(self.retry_delay * (2**attempt), self.max_retry_delay)
+        return random.uniform(self.retry_delay, max(ceiling, self.retry_delay))  # nosec B311
+
+    def _should_retry_on_server_error(self, response, attempt: int, retries: int) -> None:
         """
-        Handle server error response and determine if retry should occur.
+        Wait before retrying a retryable (429/5xx) response, or give up.
 
         Args:
             response: HTTP response object
-            endpoint: API endpoint path
             attempt: Current attempt number
             retries: Maximum number of retries
 
-        Returns:
-            APIError to raise if no more retries
-
         Raises:
             APIError: If no more retries remain
         """
-        error = APIError(
-            f"Server error: {response.status_code}",
-            status_code=response.status_code,
-            response_body=response.text,
-        )
-        if attempt < retries:
-            time.sleep(self.retry_delay * (attempt + 1))
-        else:
-            raise error
-        return error
+        if attempt >= retries:
+            if response.status_code == 429:
+                message = "Rate limited: 429"
+            else:
+                message = f"Server error: {response.status_code}"
+            raise APIError(
+                message,
+                status_code=response.status_code,
+                response_body=response.text,
+            )
+
+        delay = self._get_retry_delay(attempt, response)
+        if response.status_code == 429:
+            self._extend_backoff(delay)
+        time.sleep(delay)
 
-    def _should_retry_on_exception(self, e: Exception, attempt: int, retries: int) -> APIError:
+    def _extend_backoff(self, delay: float) -> None:
+        """Hold back new requests for at least delay seconds."""
+        with self._backoff_lock:
+            self._backoff_until = max(self._backoff_until, time.monotonic() + delay)
+
+    def _wait_for_backoff(self) -> None:
+        """Wait out any rate-limit backoff signalled by another request."""
+        remaining = self._backoff_until - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _should_retry_on_exception(self, e: Exception, attempt: int, retries: int) -> None:
         """
-        Handle request exception and determine if retry should occur.
+        Wait before retrying after a network error, or give up.
 
         Args:
-            e: Exception that occurred
+            e: Network exception that occurred
             attempt: Current attempt number
             retries: Maximum number of retries
 
-        Returns:
-            APIError to raise if no more retries
-
         Raises:
-            APIError: If no more retries remain
+            APIError: If no more retries remain (chained from the network error)
+        """
+        if attempt >= retries:
+            raise APIError(f"Request failed: {str(e)}") from e
+        time.sleep(self._get_retry_delay(attempt))
+
+    def _canonical_url(self, endpoint: str) -> str:
         """
-        error = APIError(f"Request failed: {str(e)}")
-        if attempt < retries:
-            time.sleep(self.retry_delay * (attempt + 1))
-        else:
-            raise error
-        return error
+        Build the full request URL for an endpoint path, memoized per path.
+
+        Ensures the endpoint has the .json suffix so the API returns JSON.
+        """
+        url = self._endpoint_cache.get(endpoint)
+        if url is None:
+            path = endpoint if endpoint.endswith(".json") else endpoint + ".json"
+            url = f"{self.base_url}{path}"
+            self._endpoint_cache[endpoint] = url
+        return url
+
+    def invalidate(self, endpoint: Optional[str] = None) -> None:
+        """
+        Drop cached responses.
+
+        Args:
+            endpoint: API endpoint path to invalidate (clears everything if omitted)
+        """
+        if endpoint is None:
+            self._cache.clear()
+            self._etags.clear()
+            return
+
+        url = self._canonical_url(endpoint)
+        for store in (self._cache, self._etags):
+            for key in [key for key in store if key[1] == url]:
+                store.pop(key, None)
+
+    def _store_cached_response(
+        self, cache_key: Tuple, response, cache_ttl: Optional[float]
+    ) -> None:
+        """
+        Remember a successful GET response for the TTL cache and ETag revalidation.
+
+        The raw body is stored rather than the parsed data: it is immutable,
+        so callers can't mutate the cached copy, and a hit is re-parsed with
+        _loads, which is cheaper than deep-copying the parsed payload.
+
+        Args:
+            cache_key: Request identity (method, url, params, organization)
+            response: HTTP response object
+            cache_ttl: TTL for this request (not stored in the TTL cache if None)
+        """
+        etag = response.headers.get("ETag")
+        if not cache_ttl and not isinstance(etag, str):
+            return
+
+        body = response.content
+        if cache_ttl:
+            self._cache[cache_key] = (time.monotonic(), body)
+        if isinstance(etag, str):
+            self._etags[cache_key] = (etag, body)
 
     def _request(
         self,
@@ -172,6 +347,7 @@ class MSRClient:
         params: Optional[Dict[str, Any]] = None,
         include_org_header: bool = True,
         retries: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Make an authenticated API request.
@@ -182,6 +358,7 @@ class MSRClient:
             params: Query parameters
             include_org_header: Include X-Organization-Id header
             retries: Number of retries (defaults to self.max_retries)
+            cache_ttl: Seconds to cache a successful GET response (no caching if None)
 
         Returns:
             Parsed JSON response (unwrapped from MSR response envelope)
@@ -192,39 +369,59 @@ class MSRClient:
         if retries is None:
             retries = self.max_retries
 
-        session = self._get_session()
+        verb = method.upper()
+        try:
+            session_method, params_kwarg = self._VERB_TABLE[verb]
+        except KeyError:
+            raise APIError(f"Unsupported HTTP method: {method}") from None
+
+        url = self._canonical_url(endpoint)
 
-        # Ensure endpoint has .json suffix for JSON response
-        if not endpoint.endswith(".json"):
-            endpoint = endpoint + ".json"
+        org_id = self.organization_id if include_org_header else None
 
-        url = f"{self.base_url}{endpoint}"
+        # Serve fresh cache hits before any header, session or signing work
+        cache_key = None
+        validator = None
+        if verb == "GET":
+            cache_key = ("GET", url, tuple(sorted(params.items())) if params else (), org_id)
+            cached = self._cache.get(cache_key)
+            if cache_ttl and cached is not None and time.monotonic() - cached[0] < cache_ttl:
+                return self._unwrap(_loads(cached[1]))
+            validator = self._etags.get(cache_key)
 
         headers = {}
-        if include_org_header and self.organization_id:
-            headers["X-Organization-Id"] = self.organization_id
+        if org_id:
+            headers["X-Organization-Id"] = org_id
 
-        last_error: APIError = APIError("Request failed with unknown error")
+        # Revalidate with the server if we hold an ETag for this resource
+        if validator is not None:
+            headers["If-None-Match"] = validator[0]
 
+        send = getattr(self._get_session(), session_method)
+        request_kwargs = {params_kwarg: params, "headers": headers}
+        self._wait_for_backoff()
         for attempt in range(retries + 1):
             try:
-                response = self._execute_http_request(method, session, url, params, headers)
-                result = self._handle_response_status(response, endpoint)
+                response = send(url, **request_kwargs)
 
-                if result is not None:
-                    return result
+                if validator is not None and response.status_code == 304:
+                    return self._unwrap(_loads(validator[1]))
 
-                # Server error - retry
-                last_error = self._should_retry_on_server_error(
-                    response, endpoint, attempt, retries
-                )
+                result = self._handle_response_status(response, endpoint)
+            except _network_errors() as e:
+                self._should_retry_on_exception(e, attempt, retries)
+                continue
+
+            if result is not None:
+                if cache_key is not None:
+                    self._store_cached_response(cache_key, response, cache_ttl)
+                return result
 
-            except APIError:
-                raise
-            except Exception as e:
-                last_error = self._should_retry_on_exception(e, attempt, retries)
+            # Rate limited or server error - retry
+            self._should_retry_on_server_error(response, attempt, retries)
 
-        raise last_error
+        # Unreachable: the final attempt either returns or raises
+        raise APIError("Request failed with unknown error")
 
     def get_me(self) -> Dict[str, Any]:
         """
@@ -233,7 +430,9 @@ class MSRClient:
         Returns:
             User profile data including organizations
         """
-        return self._request("GET", "/rest/me", include_org_header=False)
+        return self._request(
+            "GET", self.ME_PATH, include_org_header=False, cache_ttl=self.cache_ttl.get("me")
+        )
 
     def get_organization_calendar(self, organization_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -251,7 +450,11 @@ class MSRClient:
         if not org_id:
             raise ValueError(ERR_ORG_ID_REQUIRED)
 
-        return self._request("GET", f"/rest/calendars/organization/{org_id}")
+        return self._request(
+            "GET",
+            self.CALENDAR_PATH.format(org_id=org_id),
+            cache_ttl=self.cache_ttl.get("calendar"),
+        )
 
     def get_event_entrylist(self, event_id: str) -> Dict[str, Any]:
         """
@@ -268,7 +471,7 @@ class MSRClient:
         if not event_id:
             raise ValueError(ERR_EVENT_ID_REQUIRED)
 
-        return self._request("GET", f"/rest/events/{event_id}/entrylist")
+        return self._request("GET", self.ENTRYLIST_PATH.format(event_id=event_id))
 
     def get_event_attendees(self, event_id: str) -> Dict[str, Any]:
         """
@@ -285,7 +488,7 @@ class MSRClient:
         if not event_id:
             raise ValueError(ERR_EVENT_ID_REQUIRED)
 
-        return self._request("GET", f"/rest/events/{event_id}/attendees")
+        return self._request("GET", self.ATTENDEES_PATH.format(event_id=event_id))
 
     def get_event_assignments(self, event_id: str) -> Dict[str, Any]:
         """
@@ -302,7 +505,7 @@ class MSRClient:
         if not event_id:
             raise ValueError(ERR_EVENT_ID_REQUIRED)
 
-        return self._request("GET", f"/rest/events/{event_id}/assignments")
+        return self._request("GET", self.ASSIGNMENTS_PATH.format(event_id=event_id))
 
     def get_timing_feed(self, event_id: str) -> Dict[str, Any]:
         """
@@ -319,16 +522,59 @@ class MSRClient:
         if not event_id:
             raise ValueError(ERR_EVENT_ID_REQUIRED)
 
-        return self._request("GET", f"/rest/events/{event_id}/feeds/timing")
+        return self._request("GET", self.TIMING_FEED_PATH.format(event_id=event_id))
+
+    def get_events_bulk(
+        self, event_ids: List[str], endpoints: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch event endpoints for several events concurrently.
+
+        All requests share one thread pool and the client's rate-limit gate,
+        so a 429 seen by one worker holds back the others.
+
+        Args:
+            event_ids: Event IDs to fetch
+            endpoints: Endpoint keys from EVENT_ENDPOINTS (defaults to all)
+
+        Returns:
+            Dict mapping event ID to a dict of endpoint key -> data
+            (or {"error": ...} if that request failed)
+
+        Raises:
+            ValueError: If an unknown endpoint key is requested
+        """
+        keys = list(endpoints) if endpoints is not None else list(self.EVENT_ENDPOINTS)
+        unknown = [key for key in keys if key not in self.EVENT_ENDPOINTS]
+        if unknown:
+            raise ValueError(f"Unknown event endpoint(s): {', '.join(unknown)}")
+
+        results: Dict[str, Dict[str, Any]] = {event_id: {} for event_id in event_ids}
+        jobs = [(event_id, key) for event_id in results for key in keys]
+        if not jobs:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(len(jobs), 8)) as executor:
+            futures = [
+                (event_id, key, executor.submit(getattr(self, self.EVENT_ENDPOINTS[key]), event_id))
+                for event_id, key in jobs
+            ]
+            for event_id, key, future in futures:
+                try:
+                    results[event_id][key] = future.result()
+                except APIError as e:
+                    results[event_id][key] = {"error": str(e)}
+
+        return results
 
     def _fetch_user_profile(self, results: Dict[str, Any]) -> None:
         """Fetch and store user profile data."""
-        print("  Fetching /rest/me...")
+        logger.info("  Fetching /rest/me...")
         try:
             results["me"] = self.get_me()
-            print("    [OK] User profile retrieved")
+            logger.info("    [OK] User profile retrieved")
         except APIError as e:
-            print(f"    [ERROR] {e}")
+            logger.error("    [ERROR] %s", e)
             results["me"] = {"error": str(e)}
 
     def _fetch_organization_calendar(
@@ -343,19 +589,19 @@ class MSRClient:
         if not self.organization_id:
             return event_id
 
-        print(f"  Fetching organization calendar (org: {self.organization_id})...")
+        logger.info("  Fetching organization calendar (org: %s)...", self.organization_id)
         try:
             results["calendar"] = self.get_organization_calendar()
-            print("    [OK] Calendar retrieved")
+            logger.info("    [OK] Calendar retrieved")
 
             # Get first event ID if not provided
             if not event_id:
                 events = results["calendar"].get("events", [])
                 if events:
                     event_id = events[0].get("id")
-                    print(f"    Using first event from calendar: {event_id}")
+                    logger.info("    Using first event from calendar: %s", event_id)
         except APIError as e:
-            print(f"    [ERROR] {e}")
+            logger.error("    [ERROR] %s", e)
             results["calendar"] = {"error": str(e)}
 
         return event_id
@@ -364,12 +610,12 @@ class MSRClient:
         self, results: Dict[str, Any], key: str, method, description: str, event_id: str
     ) -> None:
         """Fetch data from a single event endpoint."""
-        print(f"  Fetching {description} (event: {event_id})...")
+        logger.info("  Fetching %s (event: %s)...", description, event_id)
         try:
             results[key] = method(event_id)
-            print(f"    [OK] {description} retrieved")
+            logger.info("    [OK] %s retrieved", description)
         except APIError as e:
-            print(f"    [ERROR] {e}")
+            logger.error("    [ERROR] %s", e)
             results[key] = {"error": str(e)}
 
     def get_all_endpoint_data(self, event_id: Optional[str] = None) -> Dict[str, Any]:
@@ -384,28 +630,40 @@ class MSRClient:
         """
         results: Dict[str, Any] = {}
 
-        # Fetch user profile
-        self._fetch_user_profile(results)
-
-        # Fetch organization calendar and potentially get event_id
-        event_id = self._fetch_organization_calendar(results, event_id)
-
-        # Event-specific endpoints (require event_id)
-        if event_id:
-            event_endpoints = [
-                ("entrylist", self.get_event_entrylist, "Entry list"),
-                ("attendees", self.get_event_attendees, "Attendees"),
-                ("assignments", self.get_event_assignments, "Assignments"),
-                ("timing", self.get_timing_feed, "Timing feed"),
-            ]
-
-            for key, method, description in event_endpoints:
-                self._fetch_event_endpoint(results, key, method, description, event_id)
-        else:
-            print("  [SKIP] No event ID available - skipping event-specific endpoints")
-            print("         Use --event-id to specify an event, or ensure calendar has events")
+        event_endpoints = [
+            ("entrylist", self.get_event_entrylist, "Entry list"),
+            ("attendees", self.get_event_attendees, "Attendees"),
+            ("assignments", self.get_event_assignments, "Assignments"),
+            ("timing", self.get_timing_feed, "Timing feed"),
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Fetch user profile and organization calendar concurrently;
+            # the calendar may supply the event_id for the next wave
+            profile_future = executor.submit(self._fetch_user_profile, results)
+            calendar_future = executor.submit(self._fetch_organization_calendar, results, event_id)
+            profile_future.result()
+            event_id = calendar_future.result()
+
+            # Event-specific endpoints (require event_id) are independent of each other
+            if event_id:
+                futures = [
+                    executor.submit(
+                        self._fetch_event_endpoint, results, key, method, description, event_id
+                    )
+                    for key, method, description in event_endpoints
+                ]
+                for future in futures:
+                    future.result()
+            else:
+                logger.warning(
+                    "  [SKIP] No event ID available - skipping event-specific endpoints\n"
+                    "         Use --event-id to specify an event, or ensure calendar has events"
+                )
 
-        return results
+        # Restore a stable endpoint order regardless of completion order
+        order = ["me", "calendar"] + [key for key, _, _ in event_endpoints]
+        return {key: results[key] for key in order if key in results}
 
 
 def create_client_from_oauth(oauth: MSROAuth, organization_id: Optional[str] = None) -> MSRClient:
@@ -419,8 +677,10 @@ def create_client_from_oauth(oauth: MSROAuth, organization_id: Optional[str] = N
     Returns:
         Configured MSRClient instance
     """
+    client = MSRClient(oauth=oauth, organization_id=organization_id)
+
     # Use provided org ID, or fall back to first organization from profile
-    if not organization_id and oauth.organizations:
-        organization_id = oauth.organizations[0].get("id")
+    if not organization_id:
+        client.organization_id = client.default_org_id
 
-    return MSRClient(oauth=oauth, organization_id=organization_id)
+    return client
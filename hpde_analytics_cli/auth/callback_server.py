@@ -0,0 +1,100 @@
+"""
+Local HTTP server that receives the OAuth authorization callback.
+
+Kept apart from the oauth module so http.server is only imported when the
+interactive authorization flow actually runs.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class OAuthCallbackHandler(BaseHTTPRequestHandler):
+    """HTTP request handler that captures OAuth callback parameters."""
+
+    oauth_verifier = None
+    oauth_token = None
+    callback_received = False
+
+    def do_GET(self):
+        """Handle GET request from OAuth callback."""
+        # Parse the query string
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+
+        # Log callback received (without sensitive path details)
+        print("\n  [Callback] Received OAuth callback request")
+
+        # Ignore non-callback requests (favicon, root path, etc.) with an empty reply
+        if not parsed.path.startswith("/callback"):
+            self.send_response(204)
+            self.end_headers()
+            return
+
+        print("  [Callback] OAuth parameters received")
+
+        # Extract OAuth parameters, then flag the callback so the waiting
+        # thread never sees the flag before the verifier
+        OAuthCallbackHandler.oauth_verifier = params.get("oauth_verifier", [None])[0]
+        OAuthCallbackHandler.oauth_token = params.get("oauth_token", [None])[0]
+        OAuthCallbackHandler.callback_received = True
+
+        # Check for OAuth error response
+        oauth_error = params.get("error", [None])[0]
+        error_description = params.get("error_description", ["Unknown error"])[0]
+
+        # Send response to browser
+        self.send_response(200)
+        self.send_header("Content-type", "text/html")
+        self.end_headers()
+
+        if OAuthCallbackHandler.oauth_verifier:
+            response = """
+            <html>
+            <head><title>Authorization Successful</title></head>
+            <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
+                <h1 style="color: green;">Authorization Successful!</h1>
+                <p>You can close this window and return to the terminal.</p>
+                <p>Verification code received. The script will continue automatically.</p>
+            </body>
+            </html>
+            """
+        elif oauth_error:
+            response = f"""
+            <html>
+            <head><title>Authorization Denied</title></head>
+            <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
+                <h1 style="color: red;">Authorization Denied</h1>
+                <p>Error: {oauth_error}</p>
+                <p>{error_description}</p>
+            </body>
+            </html>
+            """
+        else:
+            response = f"""
+            <html>
+            <head><title>Authorization Issue</title></head>
+            <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
+                <h1 style="color: orange;">Missing Verification Code</h1>
+                <p>Received callback but no oauth_verifier parameter.</p>
+                <p>Parameters received: {params}</p>
+            </body>
+            </html>
+            """
+
+        self.wfile.write(response.encode())
+
+    def log_message(self, format, *args):
+        """Suppress HTTP server logging."""
+        pass
+
+
+class CallbackServer(ThreadingHTTPServer):
+    """
+    Local callback server.
+
+    Requests are handled on daemon threads so a slow favicon request cannot
+    delay the callback.
+    """
+
+    daemon_threads = True
@@ -5,17 +5,33 @@ Securely stores and retrieves OAuth credentials using the system keyring.
 Falls back to environment variables/.env file if keyring is unavailable.
 """
 
+import functools
 import getpass
+import json
 import os
-from typing import Optional, Tuple
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 # Application identifier for keyring storage
 APP_NAME = "hpde-analytics-cli"
 
 # Credential keys
+KEY_COMBINED = "msr_oauth"
+
+# Legacy per-value keys, still read when no combined entry exists
 KEY_CONSUMER_KEY = "msr_consumer_key"
 KEY_CONSUMER_SECRET = "msr_consumer_secret"
 
+# A working keyring probe is remembered across runs in this file for PROBE_CACHE_TTL seconds
+PROBE_CACHE_FILE = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / APP_NAME
+    / "keyring_probe.json"
+)
+PROBE_CACHE_TTL = 3600.0
+
 # Try to import keyring, but don't fail if unavailable
 try:
     import keyring
@@ -24,6 +40,55 @@ try:
 except ImportError:
     KEYRING_AVAILABLE = False
 
+# Resolved (consumer_key, consumer_secret) per app name, shared by all managers
+_CRED_CACHE: Dict[str, Tuple[str, str]] = {}
+_CRED_CACHE_LOCK = threading.Lock()
+
+# Snapshot of the credential environment variables, taken by refresh_env()
+_ENV_KEY: Optional[str] = None
+_ENV_SECRET: Optional[str] = None
+
+
+def refresh_env() -> None:
+    """
+    Re-read the credential environment variables.
+
+    The variables are snapshotted at import; call this after the environment
+    changes (e.g. once a .env file has been loaded).
+    """
+    global _ENV_KEY, _ENV_SECRET
+
+    _ENV_KEY = os.environ.get("MSR_CONSUMER_KEY")
+    _ENV_SECRET = os.environ.get("MSR_CONSUMER_SECRET")
+    with _CRED_CACHE_LOCK:
+        _CRED_CACHE.clear()
+
+
+refresh_env()
+
+
+def _read_probe_cache() -> bool:
+    """
+    Check the sentinel file for a recent successful keyring probe.
+
+    Returns:
+        True if a working keyring was recorded within PROBE_CACHE_TTL
+    """
+    try:
+        data = json.loads(PROBE_CACHE_FILE.read_text())
+        return data["available"] is True and time.time() - float(data["ts"]) < PROBE_CACHE_TTL
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def _write_probe_cache() -> None:
+    """Record a successful keyring probe in the sentinel file, ignoring I/O errors."""
+    try:
+        PROBE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        PROBE_CACHE_FILE.write_text(json.dumps({"available": True, "ts": time.time()}))
+    except OSError:
+        pass
+
 
 class CredentialManager:
     """
@@ -43,24 +108,56 @@ class CredentialManager:
             app_name: Application identifier for keyring storage
         """
         self.app_name = app_name
+        self._keyring_probe: Optional[bool] = None
+        self._probe_lock = threading.Lock()
 
     def keyring_available(self) -> bool:
-        """Check if keyring is available and functional."""
+        """
+        Check if keyring is available and functional.
+
+        The backend probe runs once per instance; later calls return the
+        memoized result. A successful probe is also recorded in PROBE_CACHE_FILE
+        so later runs within PROBE_CACHE_TTL skip the probe entirely; a failed
+        one is never persisted, so the next run probes again.
+        """
         if not KEYRING_AVAILABLE:
             return False
 
-        # Test if keyring backend is actually working
-        try:
-            # Try to get a non-existent key to test functionality
-            keyring.get_password(self.app_name, "__test__")
-            return True
-        except Exception:
-            return False
+        if self._keyring_probe is not None:
+            return self._keyring_probe
+
+        with self._probe_lock:
+            if self._keyring_probe is None:
+                available = _read_probe_cache()
+                if not available:
+                    # Test if keyring backend is actually working
+                    try:
+                        # Try to get a non-existent key to test functionality
+                        keyring.get_password(self.app_name, "__test__")
+                        available = True
+                        _write_probe_cache()
+                    except Exception:
+                        available = False
+                self._keyring_probe = available
+            return self._keyring_probe
+
+    def invalidate_keyring_probe(self) -> None:
+        """Forget the memoized and persisted keyring probe so the next check re-probes."""
+        with self._probe_lock:
+            self._keyring_probe = None
+            try:
+                PROBE_CACHE_FILE.unlink()
+            except OSError:
+                pass
 
     def get_credentials_from_keyring(self) -> Tuple[Optional[str], Optional[str]]:
         """
         Retrieve credentials from system keyring.
 
+        Both values live in a single JSON entry so one backend round-trip
+        fetches them. Credentials stored by older versions as two separate
+        entries are still read.
+
         Returns:
             Tuple of (consumer_key, consumer_secret) or (None, None) if not found
         """
@@ -68,6 +165,11 @@ class CredentialManager:
             return None, None
 
         try:
+            payload = keyring.get_password(self.app_name, KEY_COMBINED)
+            if payload:
+                data = json.loads(payload)
+                return data.get("key"), data.get("secret")
+
             consumer_key = keyring.get_password(self.app_name, KEY_CONSUMER_KEY)
             consumer_secret = keyring.get_password(self.app_name, KEY_CONSUMER_SECRET)
             return consumer_key, consumer_secret
@@ -81,9 +183,13 @@ class CredentialManager:
         Returns:
             Tuple of (consumer_key, consumer_secret) or (None, None) if not found
         """
-        consumer_key = os.environ.get("MSR_CONSUMER_KEY")
-        consumer_secret = os.environ.get("MSR_CONSUMER_SECRET")
-        return consumer_key, consumer_secret
+        return _ENV_KEY, _ENV_SECRET
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Forget cached credentials so the next lookup re-reads keyring and environment."""
+        with _CRED_CACHE_LOCK:
+            _CRED_CACHE.clear()
 
     def get_credentials(self) -> Tuple[str, str]:
         """
@@ -93,21 +199,33 @@ class CredentialManager:
         1. System keyring
         2. Environment variables
 
+        Resolved credentials are cached for the process, so repeat calls skip
+        the keyring entirely.
+
         Returns:
             Tuple of (consumer_key, consumer_secret)
 
         Raises:
             ValueError: If credentials cannot be found from any source
         """
-        # Try keyring first
-        consumer_key, consumer_secret = self.get_credentials_from_keyring()
-        if consumer_key and consumer_secret:
-            return consumer_key, consumer_secret
+        cached = _CRED_CACHE.get(self.app_name)
+        if cached is not None:
+            return cached
 
-        # Fall back to environment variables
-        consumer_key, consumer_secret = self.get_credentials_from_env()
-        if consumer_key and consumer_secret:
-            return consumer_key, consumer_secret
+        with _CRED_CACHE_LOCK:
+            cached = _CRED_CACHE.get(self.app_name)
+            if cached is not None:
+                return cached
+
+            # Try keyring first
+            consumer_key, consumer_secret = self.get_credentials_from_keyring()
+            if not (consumer_key and consumer_secret):
+                # Fall back to environment variables
+                consumer_key, consumer_secret = self.get_credentials_from_env()
+
+            if consumer_key and consumer_secret:
+                _CRED_CACHE[self.app_name] = (consumer_key, consumer_secret)
+                return consumer_key, consumer_secret
 
         # No credentials found
         raise ValueError(
@@ -130,30 +248,39 @@ class CredentialManager:
             print("Warning: System keyring not available. Cannot store credentials securely.")
             return False
 
+        payload = json.dumps({"key": consumer_key, "secret": consumer_secret})
         try:
-            keyring.set_password(self.app_name, KEY_CONSUMER_KEY, consumer_key)
-            keyring.set_password(self.app_name, KEY_CONSUMER_SECRET, consumer_secret)
+            keyring.set_password(self.app_name, KEY_COMBINED, payload)
+            self.invalidate_cache()
             return True
         except Exception as e:
             print(f"Warning: Failed to store credentials in keyring: {e}")
+            self.invalidate_keyring_probe()
             return False
 
     def delete_credentials(self) -> bool:
         """
         Delete credentials from system keyring.
 
+        Removes the combined entry and any legacy per-value entries.
+
         Returns:
             True if deleted successfully, False otherwise
         """
         if not self.keyring_available():
             return False
 
-        try:
-            keyring.delete_password(self.app_name, KEY_CONSUMER_KEY)
-            keyring.delete_password(self.app_name, KEY_CONSUMER_SECRET)
-            return True
-        except Exception:
-            return False
+        deleted = False
+        for key in (KEY_COMBINED, KEY_CONSUMER_KEY, KEY_CONSUMER_SECRET):
+            try:
+                keyring.delete_password(self.app_name, key)
+                deleted = True
+            except Exception:
+                continue
+
+        if deleted:
+            self.invalidate_cache()
+        return deleted
 
     def has_stored_credentials(self) -> bool:
         """
@@ -251,6 +378,7 @@ class CredentialManager:
         print()
 
 
+@functools.lru_cache(maxsize=1)
 def get_credential_manager() -> CredentialManager:
-    """Get a configured credential manager instance."""
+    """Get the shared credential manager instance, so its keyring probe is paid once."""
     return CredentialManager()
@@ -7,108 +7,101 @@ Implements the three-legged OAuth flow:
 3. Access token exchange
 """
 
-import json
+import contextlib
 import os
 import socket
+import sys
 import threading
-import webbrowser
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import parse_qs, urlparse
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
-from requests_oauthlib import OAuth1Session
+from hpde_analytics_cli.auth import credentials
+from hpde_analytics_cli.utils import _dumps, _loads
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+    from requests_oauthlib import OAuth1Session
 
 # Default callback port for local OAuth flow
 DEFAULT_CALLBACK_PORT = 8089
 
+# Seconds to wait for the user to complete authorization (5 minutes)
+CALLBACK_TIMEOUT = 300.0
 
-class OAuthCallbackHandler(BaseHTTPRequestHandler):
-    """HTTP request handler that captures OAuth callback parameters."""
-
-    oauth_verifier = None
-    oauth_token = None
-
-    def do_GET(self):
-        """Handle GET request from OAuth callback."""
-        # Parse the query string
-        parsed = urlparse(self.path)
-        params = parse_qs(parsed.query)
-
-        # Log callback received (without sensitive path details)
-        print("\n  [Callback] Received OAuth callback request")
-
-        # Ignore non-callback requests (favicon, root path, etc.)
-        if not parsed.path.startswith("/callback"):
-            self.send_response(200)
-            self.send_header("Content-type", "text/html")
-            self.end_headers()
-            response = """
-            <html>
-            <head><title>Waiting...</title></head>
-            <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
-                <p>Waiting for MotorsportsReg authorization callback...</p>
-                <p>Please complete the authorization on motorsportreg.com</p>
-            </body>
-            </html>
-            """
-            self.wfile.write(response.encode())
-            return
-
-        print("  [Callback] OAuth parameters received")
-
-        # Extract OAuth parameters
-        OAuthCallbackHandler.oauth_verifier = params.get("oauth_verifier", [None])[0]
-        OAuthCallbackHandler.oauth_token = params.get("oauth_token", [None])[0]
-
-        # Check for OAuth error response
-        oauth_error = params.get("error", [None])[0]
-        error_description = params.get("error_description", ["Unknown error"])[0]
-
-        # Send response to browser
-        self.send_response(200)
-        self.send_header("Content-type", "text/html")
-        self.end_headers()
-
-        if OAuthCallbackHandler.oauth_verifier:
-            response = """
-            <html>
-            <head><title>Authorization Successful</title></head>
-            <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
-                <h1 style="color: green;">Authorization Successful!</h1>
-                <p>You can close this window and return to the terminal.</p>
-                <p>Verification code received. The script will continue automatically.</p>
-            </body>
-            </html>
-            """
-        elif oauth_error:
-            response = f"""
-            <html>
-            <head><title>Authorization Denied</title></head>
-            <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
-                <h1 style="color: red;">Authorization Denied</h1>
-                <p>Error: {oauth_error}</p>
-                <p>{error_description}</p>
-            </body>
-            </html>
-            """
-        else:
-            response = f"""
-            <html>
-            <head><title>Authorization Issue</title></head>
-            <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
-                <h1 style="color: orange;">Missing Verification Code</h1>
-                <p>Received callback but no oauth_verifier parameter.</p>
-                <p>Parameters received: {params}</p>
-            </body>
-            </html>
-            """
+# Seconds between checks for the callback while the server is idle
+CALLBACK_POLL_INTERVAL = 0.5
+
+# Snapshot of the OAuth environment variables, taken by refresh_env()
+_ENV_BASE_URL = "https://api.motorsportreg.com"
+_ENV_CALLBACK_URL: Optional[str] = None
+_ENV_CALLBACK_PORT = str(DEFAULT_CALLBACK_PORT)
 
-        self.wfile.write(response.encode())
 
-    def log_message(self, format, *args):
-        """Suppress HTTP server logging."""
-        pass
+def refresh_env() -> None:
+    """
+    Re-read the OAuth and credential environment variables.
+
+    The variables are snapshotted at import; call this after the environment
+    changes (e.g. once a .env file has been loaded).
+    """
+    global _ENV_BASE_URL, _ENV_CALLBACK_URL, _ENV_CALLBACK_PORT
+
+    _ENV_BASE_URL = os.environ.get("MSR_BASE_URL", "https://api.motorsportreg.com")
+    _ENV_CALLBACK_URL = os.environ.get("MSR_CALLBACK_URL")  # None = use localhost default
+    _ENV_CALLBACK_PORT = os.environ.get("MSR_CALLBACK_PORT", str(DEFAULT_CALLBACK_PORT))
+    credentials.refresh_env()
+
+
+refresh_env()
+
+
+@contextlib.contextmanager
+def _exclusive_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive inter-process lock on lock_path for the duration of the block.
+
+    Uses fcntl.flock on POSIX and msvcrt.locking on Windows. Blocks until the
+    lock is free, telling the user if another process is holding it.
+
+    Args:
+        lock_path: Lock file to create (if needed) and lock
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+
+            f.seek(0)
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            except OSError:
+                print("Another authentication is in progress; waiting for it to finish...")
+                while True:
+                    try:
+                        # LK_LOCK gives up after ~10 seconds, so keep retrying
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                print("Another authentication is in progress; waiting for it to finish...")
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
 
 
 class MSROAuth:
@@ -119,6 +112,9 @@ class MSROAuth:
     ACCESS_TOKEN_URL = "/rest/tokens/access"
     ME_URL = "/rest/me.json"  # Use .json suffix for JSON response
 
+    # Parsed token files keyed by path, tagged with the mtime they were read at
+    _TOKEN_CACHE: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
     def __init__(
         self,
         consumer_key: str,
@@ -160,6 +156,11 @@ class MSROAuth:
         self.profile_id: Optional[str] = None
         self.organizations: List[Dict[str, Any]] = []
 
+        # Authenticated session, reused while the access token is unchanged
+        self._session: Optional["OAuth1Session"] = None
+        self._session_token: Optional[Tuple[Optional[str], Optional[str]]] = None
+        self._session_lock = threading.Lock()
+
         # Try to load existing tokens
         self._load_tokens()
 
@@ -167,41 +168,65 @@ class MSROAuth:
         """
         Load access tokens from file if they exist.
 
+        The parsed file is cached per process and reused while its
+        modification time is unchanged.
+
         Returns:
             True if tokens were loaded successfully, False otherwise
         """
-        if not self.token_file.exists():
+        try:
+            mtime_ns = os.stat(self.token_file).st_mtime_ns
+        except FileNotFoundError:
             return False
 
         try:
-            with open(self.token_file, "r") as f:
-                data = json.load(f)
-                self.access_token = data.get("access_token")
-                self.access_token_secret = data.get("access_token_secret")
-                self.profile_id = data.get("profile_id")
-                self.organizations = data.get("organizations", [])
-
-                if self.access_token and self.access_token_secret:
-                    print(f"Loaded existing access tokens from {self.token_file}")
-                    return True
-        except (json.JSONDecodeError, IOError) as e:
+            cached = self._TOKEN_CACHE.get(self.token_file)
+            if cached is not None and cached[0] == mtime_ns:
+                data = cached[1]
+            else:
+                data = _loads(self.token_file.read_bytes())
+                self._TOKEN_CACHE[self.token_file] = (mtime_ns, data)
+
+            self.access_token = data.get("access_token")
+            self.access_token_secret = data.get("access_token_secret")
+            self.profile_id = data.get("profile_id")
+            self.organizations = list(data.get("organizations", []))
+
+            if self.access_token and self.access_token_secret:
+                print(f"Loaded existing access tokens from {self.token_file}")
+                return True
+        except (ValueError, IOError) as e:
             print(f"Warning: Could not load tokens: {e}")
 
         return False
 
     def _save_tokens(self) -> None:
-        """Save access tokens to file."""
-        self.token_file.parent.mkdir(parents=True, exist_ok=True)
+        """
+        Save access tokens to file.
 
+        The file is replaced atomically, and left untouched when its contents
+        would not change.
+        """
         data = {
             "access_token": self.access_token,
             "access_token_secret": self.access_token_secret,
             "profile_id": self.profile_id,
             "organizations": self.organizations,
         }
+        new_bytes = _dumps(data, indent=True)
 
-        with open(self.token_file, "w") as f:
-            json.dump(data, f, indent=2)
+        try:
+            if self.token_file.read_bytes() == new_bytes:
+                return
+        except OSError:
+            pass
+
+        self.token_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.token_file.with_name(self.token_file.name + ".tmp")
+        tmp_file.write_bytes(new_bytes)
+        os.replace(tmp_file, self.token_file)
+
+        self._TOKEN_CACHE[self.token_file] = (os.stat(self.token_file).st_mtime_ns, data)
 
         print(f"Access tokens saved to {self.token_file}")
 
@@ -221,6 +246,8 @@ class MSROAuth:
         """
         print("\n[Step 1/3] Requesting temporary token...")
 
+        from requests_oauthlib import OAuth1Session
+
         oauth = OAuth1Session(
             self.consumer_key,
             client_secret=self.consumer_secret,
@@ -275,6 +302,8 @@ class MSROAuth:
         """
         print("\n[Step 3/3] Exchanging for access token...")
 
+        from requests_oauthlib import OAuth1Session
+
         oauth = OAuth1Session(
             self.consumer_key,
             client_secret=self.consumer_secret,
@@ -306,10 +335,15 @@ class MSROAuth:
             "profile_id": self.profile_id,
         }
 
-    def get_oauth_session(self) -> OAuth1Session:
+    def get_oauth_session(self) -> "OAuth1Session":
         """
         Get an authenticated OAuth1Session for making API requests.
 
+        The session is created once and reused while the access token is
+        unchanged, so its pooled keep-alive connections carry across calls
+        and across API clients. This handler owns it: a session for an old
+        token is closed when replaced, and close_session() releases it.
+
         Returns:
             Configured OAuth1Session instance
 
@@ -319,6 +353,25 @@ class MSROAuth:
         if not self.has_valid_tokens():
             raise Exception("No valid access tokens. Please authenticate first.")
 
+        token = (self.access_token, self.access_token_secret)
+        session = self._session
+        if session is not None and self._session_token == token:
+            return session
+
+        with self._session_lock:
+            if self._session is not None and self._session_token == token:
+                return self._session
+            if self._session is not None:
+                self._session.close()
+            self._session = self._build_oauth_session()
+            self._session_token = token
+            return self._session
+
+    def _build_oauth_session(self) -> "OAuth1Session":
+        """Create an OAuth1Session for the current access token with a pooled adapter."""
+        from requests.adapters import HTTPAdapter
+        from requests_oauthlib import OAuth1Session
+
         session = OAuth1Session(
             self.consumer_key,
             client_secret=self.consumer_secret,
@@ -333,9 +386,17 @@ class MSROAuth:
                 "Content-Type": "application/json",
             }
         )
-
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
         return session
 
+    def close_session(self) -> None:
+        """Close the authenticated session, if one is open, releasing its pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._session_token = None
+
     def validate_connection(self) -> Dict[str, Any]:
         """
         Validate the OAuth connection by calling /rest/me endpoint.
@@ -357,6 +418,8 @@ class MSROAuth:
             # Tokens are invalid, clear them
             self.access_token = None
             self.access_token_secret = None
+            self.close_session()
+            self._TOKEN_CACHE.pop(self.token_file, None)
             if self.token_file.exists():
                 self.token_file.unlink()
             raise Exception("Authentication failed - tokens are invalid or expired")
@@ -381,29 +444,58 @@ class MSROAuth:
 
         return profile_data
 
-    def _start_callback_server(self) -> HTTPServer:
+    def _start_callback_server(self) -> "ThreadingHTTPServer":
         """Start a local HTTP server to receive the OAuth callback."""
+        from hpde_analytics_cli.auth.callback_server import CallbackServer, OAuthCallbackHandler
+
         # Reset handler state
         OAuthCallbackHandler.oauth_verifier = None
         OAuthCallbackHandler.oauth_token = None
+        OAuthCallbackHandler.callback_received = False
 
-        server = HTTPServer(("localhost", self.callback_port), OAuthCallbackHandler)
-        server.timeout = 300  # 5 minute timeout
+        server = CallbackServer(("localhost", self.callback_port), OAuthCallbackHandler)
+        server.timeout = CALLBACK_TIMEOUT
 
         return server
 
-    def _wait_for_callback(self, server: HTTPServer, max_requests: int = 10) -> str:
-        """Wait for the OAuth callback and return the verifier."""
+    def _wait_for_callback(
+        self, server: "ThreadingHTTPServer", timeout: float = CALLBACK_TIMEOUT
+    ) -> str:
+        """
+        Wait for the OAuth callback and return the verifier.
+
+        Requests are handled until the verifier arrives, the callback request
+        comes back without one, or the timeout elapses, so any number of
+        browser prefetch/favicon requests can precede the real callback.
+
+        Args:
+            server: Callback server from _start_callback_server
+            timeout: Seconds to wait for the callback
+
+        Returns:
+            The oauth_verifier received by the callback
+
+        Raises:
+            Exception: If no verifier is received
+        """
         print(f"\nWaiting for authorization callback on port {self.callback_port}...")
         print("(Press Ctrl+C to cancel)\n")
 
-        # Handle multiple requests (browser may make favicon/other requests)
-        for _ in range(max_requests):
+        from hpde_analytics_cli.auth.callback_server import OAuthCallbackHandler
+
+        deadline = time.monotonic() + timeout
+        while not OAuthCallbackHandler.callback_received:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Requests run on worker threads, so wake up regularly to see
+            # whether one of them delivered the callback
+            server.timeout = min(remaining, CALLBACK_POLL_INTERVAL)
             server.handle_request()
 
-            verifier = OAuthCallbackHandler.oauth_verifier
-            if verifier:
-                return verifier
+        verifier = OAuthCallbackHandler.oauth_verifier
+        if verifier:
+            return verifier
 
         raise Exception(
             "No verification code received from callback. "
@@ -414,6 +506,10 @@ class MSROAuth:
         """
         Run the complete OAuth authentication flow interactively.
 
+        The flow runs under an exclusive lock on the token file, so parallel
+        invocations wait for the first one and then reuse its tokens instead
+        of starting their own browser flow.
+
         Args:
             auto_open_browser: Automatically open authorization URL in browser
 
@@ -427,6 +523,14 @@ class MSROAuth:
         print("MotorsportsReg OAuth 1.0a Authentication")
         print("=" * 60)
 
+        lock_path = self.token_file.with_name(self.token_file.name + ".lock")
+        with _exclusive_lock(lock_path):
+            # Another process may have finished the flow while we waited
+            self._load_tokens()
+            return self._run_locked_auth_flow(auto_open_browser)
+
+    def _run_locked_auth_flow(self, auto_open_browser: bool) -> dict:
+        """Run the auth flow body; the caller holds the token file lock."""
         # Check for existing valid tokens
         if self.has_valid_tokens():
             print("\nFound existing access tokens. Validating...")
@@ -455,6 +559,8 @@ class MSROAuth:
             # Open browser automatically if requested
             if auto_open_browser:
                 print("Attempting to open browser automatically...")
+                import webbrowser
+
                 try:
                     webbrowser.open(auth_url)
                     print("  Browser opened. If nothing appeared, copy the URL above.")
@@ -503,10 +609,7 @@ def create_oauth_from_env() -> MSROAuth:
     Raises:
         ValueError: If credentials cannot be found from any source
     """
-    # Import credential manager to get credentials from keyring or env
-    from hpde_analytics_cli.auth.credentials import CredentialManager
-
-    credential_manager = CredentialManager()
+    credential_manager = credentials.get_credential_manager()
 
     try:
         consumer_key, consumer_secret = credential_manager.get_credentials()
@@ -516,14 +619,10 @@ def create_oauth_from_env() -> MSROAuth:
             "or set MSR_CONSUMER_KEY and MSR_CONSUMER_SECRET environment variables."
         )
 
-    base_url = os.getenv("MSR_BASE_URL", "https://api.motorsportreg.com")
-    callback_url = os.getenv("MSR_CALLBACK_URL")  # None = use localhost default
-    callback_port = int(os.getenv("MSR_CALLBACK_PORT", str(DEFAULT_CALLBACK_PORT)))
-
     return MSROAuth(
         consumer_key=consumer_key,
         consumer_secret=consumer_secret,
-        base_url=base_url,
-        callback_url=callback_url,
-        callback_port=callback_port,
+        base_url=_ENV_BASE_URL,
+        callback_url=_ENV_CALLBACK_URL,
+        callback_port=int(_ENV_CALLBACK_PORT),
     )
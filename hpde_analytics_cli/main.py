@@ -5,26 +5,46 @@ Entry point for the application.
 """
 
 import argparse
+import functools
 import json
+import logging
 import os
 import sys
-from datetime import datetime
+from logging.handlers import MemoryHandler
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-from dotenv import load_dotenv
-
-from hpde_analytics_cli.api.client import create_client_from_oauth
 from hpde_analytics_cli.auth.credentials import CredentialManager
-from hpde_analytics_cli.auth.oauth import MSROAuth, create_oauth_from_env
-from hpde_analytics_cli.integrations.email_populator import EmailPopulator, NameMatcher
-from hpde_analytics_cli.integrations.google_sheets import GoogleSheetsClient
-from hpde_analytics_cli.utils.data_export import DataExporter
-from hpde_analytics_cli.utils.field_discovery import run_field_discovery
-from hpde_analytics_cli.utils.report_generator import generate_report
+from hpde_analytics_cli.auth.oauth import MSROAuth, create_oauth_from_env, refresh_env
+from hpde_analytics_cli.utils import _dumps, run_timestamp
 
 ERR_NO_VALID_TOKENS = "Error: No valid tokens found. Run with --auth first."
 
+# Characters of each raw API response shown with --verbose
+VERBOSE_PREVIEW_CHARS = 2000
+
+# Logger used by the API client for fetch progress messages
+API_LOGGER_NAME = "hpde_analytics_cli.api"
+
+
+def configure_logging() -> None:
+    """Send API client progress messages to stdout through a small write buffer."""
+    logger = logging.getLogger(API_LOGGER_NAME)
+    if logger.handlers:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(MemoryHandler(capacity=32, flushLevel=logging.WARNING, target=stream_handler))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def flush_logging() -> None:
+    """Write out any buffered API client progress messages."""
+    for handler in logging.getLogger(API_LOGGER_NAME).handlers:
+        handler.flush()
+
 
 def print_profile(profile: Dict[str, Any]) -> None:
     """Print user profile information in a formatted way."""
@@ -76,6 +96,7 @@ def fetch_api_data(
     print("=" * 60)
 
     results = client.get_all_endpoint_data(event_id=event_id)
+    flush_logging()
 
     if verbose:
         print("\n" + "-" * 40)
@@ -83,8 +104,9 @@ def fetch_api_data(
         print("-" * 40)
         for endpoint, data in results.items():
             print(f"\n[{endpoint}]")
-            print(json.dumps(data, indent=2, default=str)[:2000])
-            if len(json.dumps(data, default=str)) > 2000:
+            text = _dumps(data, indent=True).decode("utf-8")
+            print(text[:VERBOSE_PREVIEW_CHARS])
+            if len(text) > VERBOSE_PREVIEW_CHARS:
                 print("... (truncated)")
 
     return results
@@ -100,9 +122,13 @@ def handle_discover(oauth, args) -> None:
     profile = oauth.validate_connection()
     print_profile(profile)
 
+    from hpde_analytics_cli.api.client import create_client_from_oauth
+
     client = create_client_from_oauth(oauth, organization_id=args.org_id)
     api_data = fetch_api_data(client, event_id=args.event_id, verbose=args.verbose)
 
+    from hpde_analytics_cli.utils.field_discovery import run_field_discovery
+
     output_path = Path(__file__).parent.parent / args.output
     run_field_discovery(api_data, output_path=str(output_path))
 
@@ -127,8 +153,10 @@ def handle_report(args) -> None:
 
     report_output = args.report_file
     if not report_output and args.name:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_output = str(export_dir / f"{args.name}_{timestamp}.xlsx")
+        report_output = str(export_dir / f"{args.name}_{run_timestamp()}.xlsx")
+
+    # openpyxl is only needed for reports, so load it on demand
+    from hpde_analytics_cli.utils.report_generator import generate_report
 
     report_path = generate_report(
         export_dir=str(export_dir),
@@ -157,6 +185,8 @@ def handle_export(oauth, args) -> None:
     profile = oauth.validate_connection()
     print_profile(profile)
 
+    from hpde_analytics_cli.api.client import create_client_from_oauth
+
     client = create_client_from_oauth(oauth, organization_id=args.org_id)
 
     print("\n" + "=" * 60)
@@ -168,12 +198,24 @@ def handle_export(oauth, args) -> None:
     else:
         output_dir = Path(__file__).parent.parent / "output"
 
-    exporter = DataExporter(output_dir=str(output_dir), name=args.name)
-    exported_files = exporter.export_all_data(
-        client,
-        event_id=args.event_id,
-        verbose=True,
+    from hpde_analytics_cli.utils.data_export import DataExporter
+
+    exporter = DataExporter(
+        output_dir=str(output_dir),
+        name=args.name,
+        feather=args.feather,
+        compact_json=args.compact_json,
     )
+    # Keep one keep-alive session open for every request the export makes
+    try:
+        with client:
+            exported_files = exporter.export_all_data(
+                client,
+                event_id=args.event_id,
+                verbose=True,
+            )
+    finally:
+        oauth.close_session()
 
     print("\n" + "=" * 60)
     print("Export Complete")
@@ -207,6 +249,10 @@ def handle_populate_emails(oauth, args) -> None:
         sys.exit(1)
     sa_key_path = os.path.expanduser(sa_key_path)
 
+    # gspread and google-auth are only needed for this command
+    from hpde_analytics_cli.integrations.email_populator import EmailPopulator, NameMatcher
+    from hpde_analytics_cli.integrations.google_sheets import GoogleSheetsClient
+
     populator = EmailPopulator(verbose=args.verbose)
 
     # Load MSR data from export directory or fresh API call
@@ -219,6 +265,9 @@ def handle_populate_emails(oauth, args) -> None:
             print(ERR_NO_VALID_TOKENS)
             sys.exit(1)
         oauth.validate_connection()
+
+        from hpde_analytics_cli.api.client import create_client_from_oauth
+
         client = create_client_from_oauth(oauth, organization_id=args.org_id)
         entrylist, attendees = populator.load_msr_data_from_api(client, args.event_id)
     else:
@@ -280,9 +329,13 @@ def handle_full_flow(oauth, args) -> None:
     print("Running full flow (authentication + field discovery)...")
     run_authentication(oauth, verbose=args.verbose)
 
+    from hpde_analytics_cli.api.client import create_client_from_oauth
+
     client = create_client_from_oauth(oauth, organization_id=args.org_id)
     api_data = fetch_api_data(client, event_id=args.event_id, verbose=args.verbose)
 
+    from hpde_analytics_cli.utils.field_discovery import run_field_discovery
+
     output_path = Path(__file__).parent.parent / args.output
     run_field_discovery(api_data, output_path=str(output_path))
 
@@ -291,7 +344,10 @@ def load_environment(verbose: bool = False) -> None:
     """Load environment variables from .env file if it exists."""
     env_path = Path(__file__).parent.parent / ".env"
     if env_path.exists():
+        from dotenv import load_dotenv
+
         load_dotenv(env_path)
+        refresh_env()
         if verbose:
             print(f"Loaded environment from {env_path}")
 
@@ -393,6 +449,16 @@ Examples:
         type=str,
         help="Custom name for export folder or report file (e.g., 'HPDE_TT_1_2025')",
     )
+    parser.add_argument(
+        "--feather",
+        action="store_true",
+        help="Also write raw_data/ list exports as Feather files (requires pyarrow)",
+    )
+    parser.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="Write exported endpoint JSON without indentation (smaller, faster files)",
+    )
     parser.add_argument(
         "--populate-emails",
         action="store_true",
@@ -447,12 +513,18 @@ Examples:
     return parser
 
 
+@functools.lru_cache(maxsize=1)
+def get_parser() -> argparse.ArgumentParser:
+    """Get the argument parser, building it once per process."""
+    return create_parser()
+
+
 def main():
     """Main entry point."""
-    parser = create_parser()
-    args = parser.parse_args()
+    args = get_parser().parse_args()
 
     load_environment(verbose=args.verbose)
+    configure_logging()
     handle_credential_commands(args)
 
     try:
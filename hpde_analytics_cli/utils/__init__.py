@@ -1 +1,52 @@
 """Utility modules."""
+
+import functools
+import json
+import time
+from typing import Any, Union
+
+# json.dumps builds a new encoder for every call with non-default options
+_encode_min = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str).encode
+_encode_pretty = json.JSONEncoder(indent=2, ensure_ascii=False, default=str).encode
+
+
+def _stdlib_dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize data as UTF-8 JSON with the stdlib encoder, matching orjson's output."""
+    return (_encode_pretty if indent else _encode_min)(data).encode("utf-8")
+
+
+# Parse and serialize JSON with orjson when it is installed, else the stdlib
+try:
+    import orjson
+
+    def _loads(data: Union[bytes, bytearray, str]) -> Any:
+        """
+        Parse a JSON document.
+
+        Unlike json.loads, orjson reads integers beyond the 64-bit range as
+        floats, so such values lose precision.
+        """
+        return orjson.loads(data)
+
+    def _dumps(data: Any, indent: bool = False) -> bytes:
+        """Serialize data as UTF-8 JSON, minified or with 2-space indentation."""
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(data, default=str, option=option)
+        except TypeError:
+            # orjson rejects integers beyond 64 bits without consulting default
+            return _stdlib_dumps(data, indent)
+
+except ImportError:
+
+    def _loads(data: Union[bytes, bytearray, str]) -> Any:
+        """Parse a JSON document."""
+        return json.loads(data)
+
+    _dumps = _stdlib_dumps
+
+
+@functools.lru_cache(maxsize=1)
+def run_timestamp() -> str:
+    """Return the timestamp shared by every folder and file written in this run."""
+    return time.strftime("%Y%m%d_%H%M%S")
@@ -5,56 +5,248 @@ Exports raw API data to various formats for review.
 """
 
 import csv
-import json
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from hpde_analytics_cli.utils import _dumps, run_timestamp
+
+
+def _dumps_compact(data: Any) -> str:
+    """Serialize data as compact JSON text (for list values in CSV cells)."""
+    return _dumps(data).decode("utf-8")
+
+
+# Feather exports need pyarrow, which is optional
+try:
+    import pyarrow as pa
+    from pyarrow import feather as pafeather
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Flags for writing export files straight through a file descriptor
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# JSON objects holding a list longer than this are serialized one element at a time
+STREAM_JSON_MIN_ITEMS = 500
+
+# Streamed JSON is written in blocks of about this many bytes
+_STREAM_BLOCK_SIZE = 64 * 1024
+
+
+def _write_all(fd: int, payload: Union[bytes, bytearray, memoryview]) -> None:
+    """Write all of payload to fd, continuing after short writes."""
+    view = memoryview(payload)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _write_bytes(filepath: str, payload: bytes) -> None:
+    """
+    Write bytes to a file with os.write, bypassing the buffered file layer.
+
+    Args:
+        filepath: Destination path (created or truncated)
+        payload: Bytes to write
+    """
+    fd = os.open(filepath, _WRITE_FLAGS, 0o644)
+    try:
+        _write_all(fd, payload)
+    finally:
+        os.close(fd)
+
+
+def _write_chunks(filepath: str, chunks: Iterable[bytes]) -> None:
+    """
+    Write a stream of byte chunks to a file in blocks of about _STREAM_BLOCK_SIZE.
+
+    Args:
+        filepath: Destination path (created or truncated)
+        chunks: Byte strings to write in order
+    """
+    fd = os.open(filepath, _WRITE_FLAGS, 0o644)
+    try:
+        block = bytearray()
+        for chunk in chunks:
+            block += chunk
+            if len(block) >= _STREAM_BLOCK_SIZE:
+                _write_all(fd, block)
+                block.clear()
+        _write_all(fd, block)
+    finally:
+        os.close(fd)
+
+
+def _should_stream_json(data: Any) -> bool:
+    """Return True for string-keyed objects holding at least one large list."""
+    return (
+        isinstance(data, dict)
+        and all(type(key) is str for key in data)
+        and any(
+            isinstance(value, list) and len(value) > STREAM_JSON_MIN_ITEMS
+            for value in data.values()
+        )
+    )
+
+
+def _iter_json_pretty(data: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Yield the bytes of _dumps(data, indent=True) piece by piece.
+
+    Top-level list values are serialized one element at a time and
+    re-indented to their nesting depth, so the output is byte-identical to
+    serializing the whole object at once.
+
+    Args:
+        data: String-keyed dictionary to serialize
+
+    Yields:
+        Consecutive chunks of the indented JSON document
+    """
+    if not data:
+        yield b"{}"
+        return
+    for i, (key, value) in enumerate(data.items()):
+        yield (b",\n  " if i else b"{\n  ") + _dumps(key, indent=True) + b": "
+        if isinstance(value, list) and value:
+            for j, item in enumerate(value):
+                element = _dumps(item, indent=True).replace(b"\n", b"\n    ")
+                yield (b",\n    " if j else b"[\n    ") + element
+            yield b"\n  ]"
+        else:
+            yield _dumps(value, indent=True).replace(b"\n", b"\n  ")
+    yield b"\n}"
 
 
 class DataExporter:
     """Exports MSR API data to files for review."""
 
-    def __init__(self, output_dir: str = "output", name: Optional[str] = None):
+    def __init__(
+        self,
+        output_dir: str = "output",
+        name: Optional[str] = None,
+        timestamp: Optional[str] = None,
+        feather: bool = False,
+        compact_json: bool = False,
+    ):
         """
         Initialize the data exporter.
 
         Args:
             output_dir: Base directory for output files
             name: Optional custom name for the export folder
+            timestamp: Timestamp for folder and file names (defaults to the run timestamp)
+            feather: Also write raw_data/ list exports as Feather files (requires pyarrow)
+            compact_json: Write endpoint JSON exports without indentation
         """
+        if feather and not PYARROW_AVAILABLE:
+            raise ImportError(
+                "pyarrow is required for Feather export. Install with: pip install pyarrow"
+            )
         self.output_dir = output_dir
-        self.export_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.export_timestamp = timestamp or run_timestamp()
         self.custom_name = name
+        self.feather = feather
+        self.compact_json = compact_json
+        # Flattened column names by separator, then parent prefix, then child key
+        self._key_cache: Dict[str, Dict[str, Dict[Any, str]]] = {}
+        self._ensured_dirs: Set[str] = set()
+
+    @property
+    def output_dir(self) -> str:
+        """Directory that export files are currently written to."""
+        return self._output_dir
+
+    @output_dir.setter
+    def output_dir(self, path: str) -> None:
+        self._output_dir = path
+        # Joined once per directory change so each file path is a plain concatenation
+        self._output_prefix = os.path.join(path, "")
 
     def _ensure_dir(self, path: str) -> None:
-        """Ensure directory exists."""
-        os.makedirs(path, exist_ok=True)
-
-    def _flatten_dict(self, d: Dict, parent_key: str = "", sep: str = ".") -> Dict:
+        """Ensure directory exists, creating each directory at most once per exporter."""
+        if path not in self._ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._ensured_dirs.add(path)
+
+    def _flatten_dict(
+        self, d: Dict, parent_key: str = "", sep: str = ".", stringify_lists: bool = False
+    ) -> Dict:
         """
         Flatten a nested dictionary.
 
+        Walks nested dictionaries with an explicit stack of item iterators
+        and writes every leaf straight into one output dict, keeping the same
+        key order a depth-first recursive walk would produce. Joined keys are
+        cached per exporter, so records sharing a schema reuse the same key
+        strings (and their cached hashes) instead of rebuilding them.
+
         Args:
             d: Dictionary to flatten
             parent_key: Key prefix for nested items
             sep: Separator between keys
+            stringify_lists: Encode list values as compact JSON strings (for CSV
+                cells) instead of keeping the native lists
 
         Returns:
             Flattened dictionary
         """
-        items: List[tuple] = []
-        for k, v in d.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
-            if isinstance(v, dict):
-                items.extend(self._flatten_dict(v, new_key, sep).items())
-            elif isinstance(v, list):
-                # For lists, store as JSON string to preserve data
-                items.append((new_key, json.dumps(v) if v else ""))
+        dumps = _dumps_compact
+        key_cache = self._key_cache.setdefault(sep, {})
+        out: Dict[str, Any] = {}
+        stack = [(parent_key, iter(d.items()))]
+        while stack:
+            prefix, items = stack[-1]
+            names = key_cache.get(prefix)
+            if names is None:
+                names = key_cache[prefix] = {}
+            for k, v in items:
+                new_key = names.get(k)
+                if new_key is None:
+                    new_key = names[k] = f"{prefix}{sep}{k}" if prefix else k
+                if isinstance(v, dict):
+                    stack.append((new_key, iter(v.items())))
+                    break
+                elif stringify_lists and isinstance(v, list):
+                    # For lists, store as compact JSON string to preserve data
+                    out[new_key] = dumps(v) if v else ""
+                else:
+                    out[new_key] = v
             else:
-                items.append((new_key, v))
-        return dict(items)
+                stack.pop()
+        return out
+
+    def _output_path(self, filename: str, ext: str, include_timestamp: bool) -> str:
+        """Build the output file path for a base filename and extension."""
+        if include_timestamp:
+            return f"{self._output_prefix}{filename}_{self.export_timestamp}.{ext}"
+        return f"{self._output_prefix}{filename}.{ext}"
+
+    def _copy_export(self, source: str, filename: str, ext: str) -> str:
+        """
+        Copy an already exported file instead of serializing the same data again.
+
+        Args:
+            source: Path of the file written earlier
+            filename: Base filename (without extension)
+            ext: File extension
+
+        Returns:
+            Path to the copied file
+        """
+        self._ensure_dir(self.output_dir)
+        filepath = self._output_path(filename, ext, include_timestamp=False)
+        shutil.copyfile(source, filepath)
+        return filepath
 
-    def export_json(self, data: Any, filename: str, include_timestamp: bool = True) -> str:
+    def export_json(
+        self, data: Any, filename: str, include_timestamp: bool = True, compact: bool = False
+    ) -> str:
         """
         Export data to JSON file.
 
@@ -62,19 +254,21 @@ class DataExporter:
             data: Data to export
             filename: Base filename (without extension)
             include_timestamp: Whether to include timestamp in filename
+            compact: Skip indentation, roughly halving the file size
 
         Returns:
             Path to exported file
         """
         self._ensure_dir(self.output_dir)
+        filepath = self._output_path(filename, "json", include_timestamp)
 
-        if include_timestamp:
-            filepath = os.path.join(self.output_dir, f"{filename}_{self.export_timestamp}.json")
+        if compact:
+            _write_bytes(filepath, _dumps(data))
+        elif _should_stream_json(data):
+            # Large calendars/entry lists never hold the whole document in memory
+            _write_chunks(filepath, _iter_json_pretty(data))
         else:
-            filepath = os.path.join(self.output_dir, f"{filename}.json")
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, default=str)
+            _write_bytes(filepath, _dumps(data, indent=True))
 
         return filepath
 
@@ -91,46 +285,100 @@ class DataExporter:
             Path to exported file
         """
         self._ensure_dir(self.output_dir)
-
-        if include_timestamp:
-            filepath = os.path.join(self.output_dir, f"{filename}_{self.export_timestamp}.csv")
-        else:
-            filepath = os.path.join(self.output_dir, f"{filename}.csv")
+        filepath = self._output_path(filename, "csv", include_timestamp)
 
         if not data:
             # Create empty file with note
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write("# No data available\n")
+            _write_bytes(filepath, b"# No data available\n")
             return filepath
 
-        # Flatten all records
-        flat_data = [self._flatten_dict(record) for record in data]
+        # Collect all unique keys in first-seen order (root fields first), then
+        # flatten again while writing so the flattened records are never all
+        # held in memory at once. Records whose keys are already known only
+        # cost one C-level subset check. Only the keys matter in the first
+        # pass, so list values are encoded just once, while writing.
+        flatten = self._flatten_dict
+        all_keys: Dict[str, None] = {}
+        known_keys = all_keys.keys()
+        for record in data:
+            flat = flatten(record)
+            if not known_keys >= flat.keys():
+                all_keys.update(dict.fromkeys(flat))
+        fieldnames = list(all_keys)
+
+        # Plain csv.writer with rows resolved in column order avoids
+        # DictWriter's per-row key validation and dict-to-list conversion.
+        # Records that already have every column in order (the common case
+        # for one endpoint) are written straight from their values.
+        layout = tuple(fieldnames)
+        with open(filepath, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            for record in data:
+                flat = flatten(record, stringify_lists=True)
+                if tuple(flat) == layout:
+                    writer.writerow(flat.values())
+                else:
+                    get = flat.get
+                    writer.writerow([get(key, "") for key in fieldnames])
+
+        return filepath
 
-        # Collect all unique keys
-        all_keys: Set[str] = set()
-        for record in flat_data:
-            all_keys.update(record.keys())
-        fieldnames = sorted(all_keys)
+    def export_feather(
+        self, data: List[Dict], filename: str, include_timestamp: bool = True
+    ) -> str:
+        """
+        Export list of dictionaries to an uncompressed Feather (Arrow IPC) file.
 
-        with open(filepath, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-            writer.writeheader()
-            writer.writerows(flat_data)
+        Records are flattened like CSV rows. Each column keeps its native
+        Arrow type when the values agree and falls back to strings when an
+        endpoint mixes types in one field.
 
+        Args:
+            data: List of dictionaries to export
+            filename: Base filename (without extension)
+            include_timestamp: Whether to include timestamp in filename
+
+        Returns:
+            Path to exported file
+        """
+        self._ensure_dir(self.output_dir)
+        filepath = self._output_path(filename, "feather", include_timestamp)
+
+        flat_data = [self._flatten_dict(record, stringify_lists=True) for record in data]
+        fieldnames: Dict[str, None] = {}
+        for flat in flat_data:
+            fieldnames.update(dict.fromkeys(flat))
+
+        arrays = {}
+        for key in fieldnames:
+            column = [flat.get(key) for flat in flat_data]
+            try:
+                arrays[key] = pa.array(column)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                arrays[key] = pa.array([None if v is None else str(v) for v in column])
+
+        pafeather.write_feather(pa.table(arrays), filepath, compression="uncompressed")
         return filepath
 
-    def _log_export_success(self, json_filepath: str, items: Optional[List] = None) -> None:
+    def _log_export_success(
+        self,
+        json_filepath: str,
+        items: Optional[List] = None,
+        log: Callable[[str], None] = print,
+    ) -> None:
         """
         Log successful export with optional item count.
 
         Args:
             json_filepath: Path to the JSON file
             items: Optional list of items for count display
+            log: Function that emits a progress line
         """
         if items:
-            print(f"    [OK] {json_filepath} ({len(items)} items)")
+            log(f"    [OK] {json_filepath} ({len(items)} items)")
         else:
-            print(f"    [OK] {json_filepath}")
+            log(f"    [OK] {json_filepath}")
 
     def _export_csv_if_needed(
         self,
@@ -157,6 +405,10 @@ class DataExporter:
         if items:
             csv_key = f"{endpoint_name}_csv"
             exported_files[csv_key] = self.export_csv(items, base_filename, include_timestamp=False)
+            if self.feather:
+                exported_files[f"{endpoint_name}_feather"] = self.export_feather(
+                    items, base_filename, include_timestamp=False
+                )
         return items if items else None
 
     def _export_endpoint_data(
@@ -167,6 +419,7 @@ class DataExporter:
         exported_files: Dict[str, str],
         verbose: bool,
         extract_list_key: Optional[str] = None,
+        log: Callable[[str], None] = print,
     ) -> Any:
         """
         Export data from a single endpoint (JSON and optionally CSV).
@@ -178,18 +431,19 @@ class DataExporter:
             exported_files: Dict to store file paths
             verbose: Print progress messages
             extract_list_key: Optional key to extract list data for CSV export
+            log: Function that emits a progress line
 
         Returns:
             The fetched data, or None if error occurred
         """
         if verbose:
-            print(f"  Exporting {endpoint_name}...")
+            log(f"  Exporting {endpoint_name}...")
 
         try:
             data = fetch_func()
             json_key = f"{endpoint_name}"
             exported_files[json_key] = self.export_json(
-                data, base_filename, include_timestamp=False
+                data, base_filename, include_timestamp=False, compact=self.compact_json
             )
 
             # Export CSV if list data is available
@@ -200,78 +454,83 @@ class DataExporter:
                 )
 
             if verbose:
-                self._log_export_success(exported_files[json_key], items)
+                self._log_export_success(exported_files[json_key], items, log)
 
             return data
         except Exception as e:
             if verbose:
-                print(f"    [ERROR] {e}")
+                log(f"    [ERROR] {e}")
             return None
 
     def _fetch_raw_data(
         self, client, event_id: str, exported_files: Dict[str, str], verbose: bool
     ) -> Dict[str, Any]:
-        """Fetch and export raw data from all endpoints."""
+        """
+        Fetch and export raw data from all endpoints.
+
+        Each endpoint is fetched and written on its own worker thread, so
+        files are written while other requests are still in flight. Progress
+        lines are buffered per endpoint and printed in a fixed order.
+        """
         raw_data = {}
 
-        # 1. Export user profile
-        data = self._export_endpoint_data(
-            "raw_profile",
-            client.get_me,
-            "profile_full",
-            exported_files,
-            verbose,
-        )
-        if data:
-            raw_data["me"] = data
-
-        # 2. Export organization calendar
-        data = self._export_endpoint_data(
-            "raw_calendar",
-            client.get_organization_calendar,
-            "calendar_full",
-            exported_files,
-            verbose,
-            extract_list_key="events",
-        )
-        if data:
-            raw_data["calendar"] = data
-
-        # 3. Export entry list
-        data = self._export_endpoint_data(
-            "raw_entrylist",
-            lambda: client.get_event_entrylist(event_id),
-            "entrylist_full",
-            exported_files,
-            verbose,
-            extract_list_key="assignments",
-        )
-        if data:
-            raw_data["entrylist"] = data
-
-        # 4. Export attendees
-        data = self._export_endpoint_data(
-            "raw_attendees",
-            lambda: client.get_event_attendees(event_id),
-            "attendees_full",
-            exported_files,
-            verbose,
-            extract_list_key="attendees",
-        )
-        if data:
-            raw_data["attendees"] = data
-
-        # 5. Export assignments
-        data = self._export_endpoint_data(
-            "raw_assignments",
-            lambda: client.get_event_assignments(event_id),
-            "assignments_full",
-            exported_files,
-            verbose,
-            extract_list_key="assignments",
-        )
-        if data:
-            raw_data["assignments"] = data
+        # (raw_data key, export key, fetch function, base filename, list key)
+        endpoints = [
+            ("me", "raw_profile", client.get_me, "profile_full", None),
+            (
+                "calendar",
+                "raw_calendar",
+                client.get_organization_calendar,
+                "calendar_full",
+                "events",
+            ),
+            (
+                "entrylist",
+                "raw_entrylist",
+                lambda: client.get_event_entrylist(event_id),
+                "entrylist_full",
+                "assignments",
+            ),
+            (
+                "attendees",
+                "raw_attendees",
+                lambda: client.get_event_attendees(event_id),
+                "attendees_full",
+                "attendees",
+            ),
+            (
+                "assignments",
+                "raw_assignments",
+                lambda: client.get_event_assignments(event_id),
+                "assignments_full",
+                "assignments",
+            ),
+        ]
+
+        def export(endpoint_name, fetch_func, base_filename, list_key):
+            files: Dict[str, str] = {}
+            lines: List[str] = []
+            data = self._export_endpoint_data(
+                endpoint_name,
+                fetch_func,
+                base_filename,
+                files,
+                verbose,
+                extract_list_key=list_key,
+                log=lines.append,
+            )
+            return data, files, lines
+
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+            futures = [executor.submit(export, *endpoint[1:]) for endpoint in endpoints]
+
+            for (raw_key, *_), future in zip(endpoints, futures):
+                data, files, lines = future.result()
+                for line in lines:
+                    print(line)
+                exported_files.update(files)
+                if data:
+                    raw_data[raw_key] = data
 
         return raw_data
 
@@ -285,23 +544,35 @@ class DataExporter:
         exported_files: Dict[str, str],
         verbose: bool,
     ) -> None:
-        """Export a single filtered endpoint."""
+        """
+        Export a single filtered endpoint.
+
+        The filtered files hold the same content as the raw exports, so the
+        raw files are copied when they exist rather than serialized again.
+        """
         if raw_key not in raw_data:
             return
 
         if verbose:
             print(f"  Exporting {export_key}...")
 
-        exported_files[export_key] = self.export_json(
-            raw_data[raw_key], base_filename, include_timestamp=False
-        )
+        raw_json = exported_files.get(f"raw_{export_key}")
+        if raw_json:
+            exported_files[export_key] = self._copy_export(raw_json, base_filename, "json")
+        else:
+            exported_files[export_key] = self.export_json(
+                raw_data[raw_key], base_filename, include_timestamp=False
+            )
 
         if list_key:
             items = raw_data[raw_key].get(list_key, [])
             if items:
-                exported_files[f"{export_key}_csv"] = self.export_csv(
-                    items, base_filename, include_timestamp=False
-                )
+                raw_csv = exported_files.get(f"raw_{export_key}_csv")
+                if raw_csv:
+                    csv_path = self._copy_export(raw_csv, base_filename, "csv")
+                else:
+                    csv_path = self.export_csv(items, base_filename, include_timestamp=False)
+                exported_files[f"{export_key}_csv"] = csv_path
                 if verbose:
                     print(f"    [OK] {exported_files[export_key]} ({len(items)} items)")
             else:
@@ -353,8 +624,9 @@ class DataExporter:
             folder_name = f"export_{self.export_timestamp}"
         export_subdir = os.path.join(self.output_dir, folder_name)
         raw_data_subdir = os.path.join(export_subdir, "raw_data")
-        self._ensure_dir(export_subdir)
+        # raw_data/ is nested in the export folder, so one makedirs creates both
         self._ensure_dir(raw_data_subdir)
+        self._ensured_dirs.add(export_subdir)
 
         original_output_dir = self.output_dir
 
@@ -5,16 +5,38 @@ Recursively parses JSON responses to enumerate all available fields,
 detect data types, and generate a comprehensive field inventory.
 """
 
+import functools
 import json
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Loose phone number shape used when masking samples
+_PHONE_RE = re.compile(r"^[\d\-\(\)\s\+]+$")
+
+
+@functools.lru_cache(maxsize=1024)
+def _sanitize_string(value: str) -> str:
+    """Mask emails and phone numbers and truncate long strings (cached per value)."""
+    # Mask email addresses
+    if "@" in value and "." in value:
+        parts = value.split("@")
+        return f"{parts[0][:2]}***@{parts[1]}"
+    # Mask phone numbers (basic pattern)
+    if len(value) >= 10 and _PHONE_RE.match(value):
+        return "***-***-" + value[-4:]
+    # Truncate long strings
+    if len(value) > 50:
+        return value[:47] + "..."
+    return value
 
 
 class FieldInfo:
     """Information about a discovered field."""
 
+    __slots__ = ("path", "field_type", "sample_value", "occurrences", "nullable")
+
     def __init__(self, path: str, field_type: str, sample_value: Any = None):
         self.path = path
         self.field_type = field_type
@@ -37,53 +59,65 @@ class FieldInfo:
 
         return result
 
-    def _sanitize_sample(self, value: Any) -> Any:
+    @staticmethod
+    def _sanitize_sample(value: Any) -> Any:
         """Sanitize sample value to avoid exposing PII."""
         if isinstance(value, str):
-            # Mask email addresses
-            if "@" in value and "." in value:
-                parts = value.split("@")
-                return f"{parts[0][:2]}***@{parts[1]}"
-            # Mask phone numbers (basic pattern)
-            if re.match(r"^[\d\-\(\)\s\+]+$", value) and len(value) >= 10:
-                return "***-***-" + value[-4:]
-            # Truncate long strings
-            if len(value) > 50:
-                return value[:47] + "..."
+            return _sanitize_string(value)
         return value
 
 
 class FieldDiscovery:
     """Discovers and catalogs fields from API responses."""
 
-    # Patterns for detecting special string types
+    # Patterns for detecting special string types, compiled once per process
     DATE_PATTERNS = [
-        r"^\d{4}-\d{2}-\d{2}$",  # ISO date
-        r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}",  # ISO datetime
-        r"^\d{2}/\d{2}/\d{4}$",  # US date
+        re.compile(r"^\d{4}-\d{2}-\d{2}$"),  # ISO date
+        re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}"),  # ISO datetime
+        re.compile(r"^\d{2}/\d{2}/\d{4}$"),  # US date
     ]
 
-    UUID_PATTERN = r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
-    URL_PATTERN = r"^https?://"
-    EMAIL_PATTERN = r"^[^@]+@[^@]+\.[^@]+$"
+    UUID_PATTERN = re.compile(
+        r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+    )
+    URL_PATTERN = re.compile(r"^https?://")
+    EMAIL_PATTERN = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
+
+    # Type names for the exact JSON value types, looked up before any isinstance checks
+    TYPE_NAMES = {
+        type(None): "null",
+        bool: "boolean",
+        int: "integer",
+        float: "number",
+        list: "array",
+        dict: "object",
+    }
 
     def __init__(self):
         self.fields: Dict[str, FieldInfo] = {}
-        self.endpoint_fields: Dict[str, List[str]] = {}
+        self.endpoint_fields: Dict[str, Set[str]] = {}
+        # Sorted path lists by endpoint (None for all fields), with the count they were built from
+        self._sorted_cache: Dict[Optional[str], Tuple[int, List[str]]] = {}
 
     def _check_special_string_type(self, value: str) -> Optional[str]:
-        """Check if string matches special patterns (date, uuid, url, email)."""
-        # Check for date patterns
-        for pattern in self.DATE_PATTERNS:
-            if re.match(pattern, value):
-                return "datetime" if "T" in value else "date"
+        """
+        Check if string matches special patterns (date, uuid, url, email).
+
+        Each pattern is guarded by a cheap check on a character it requires,
+        so plain names and labels usually skip every regex.
+        """
+        # Check for date patterns (all start with a digit)
+        if value[:1].isdigit():
+            for pattern in self.DATE_PATTERNS:
+                if pattern.match(value):
+                    return "datetime" if "T" in value else "date"
 
         # Check other special patterns
-        if re.match(self.UUID_PATTERN, value):
+        if value[8:9] == "-" and self.UUID_PATTERN.match(value):
             return "uuid"
-        if re.match(self.URL_PATTERN, value):
+        if value.startswith("http") and self.URL_PATTERN.match(value):
             return "url"
-        if re.match(self.EMAIL_PATTERN, value):
+        if "@" in value and self.EMAIL_PATTERN.match(value):
             return "email"
 
         return None
@@ -98,10 +132,11 @@ class FieldDiscovery:
         Returns:
             Type string (e.g., "string", "integer", "date", "url", etc.)
         """
-        if value is None:
-            return "null"
-        if isinstance(value, bool):
-            return "boolean"
+        type_name = self.TYPE_NAMES.get(type(value))
+        if type_name is not None:
+            return type_name
+
+        # Strings and subclasses of the JSON types (e.g. IntEnum, OrderedDict)
         if isinstance(value, int):
             return "integer"
         if isinstance(value, float):
@@ -124,25 +159,30 @@ class FieldDiscovery:
             path: Current JSON path (e.g., "event.venue.name")
             endpoint: Name of the endpoint this data came from
         """
-        value_type = self._detect_type(value)
-
-        if value_type == "object" and isinstance(value, dict):
+        if isinstance(value, dict):
             # Recurse into object properties
             for key, val in value.items():
                 child_path = f"{path}.{key}" if path else key
                 self._parse_value(val, child_path, endpoint)
 
-        elif value_type == "array" and isinstance(value, list):
+        elif isinstance(value, list):
             # Record the array field itself
             self._record_field(path, "array", value, endpoint)
 
             # Parse array items (use first few items for type detection)
-            for i, item in enumerate(value[:3]):  # Sample first 3 items
-                item_path = f"{path}[]"
+            item_path = f"{path}[]"
+            for item in value[:3]:  # Sample first 3 items
                 self._parse_value(item, item_path, endpoint)
 
         else:
-            # Leaf value - record it
+            # Leaf value - record it. Once a field has a non-null type, later
+            # values can only mark it nullable, so repeated records skip the
+            # type (and regex) detection entirely.
+            field = self.fields.get(path)
+            if field is not None and field.field_type != "null":
+                value_type = "null" if value is None else field.field_type
+            else:
+                value_type = self._detect_type(value)
             self._record_field(path, value_type, value, endpoint)
 
     def _record_field(self, path: str, field_type: str, value: Any, endpoint: str) -> None:
@@ -176,10 +216,26 @@ class FieldDiscovery:
             self.fields[path] = field
 
         # Track which endpoints have this field
-        if endpoint not in self.endpoint_fields:
-            self.endpoint_fields[endpoint] = []
-        if path not in self.endpoint_fields[endpoint]:
-            self.endpoint_fields[endpoint].append(path)
+        self.endpoint_fields.setdefault(endpoint, set()).add(path)
+
+    def _sorted_paths(self, endpoint: Optional[str] = None) -> List[str]:
+        """
+        Return field paths in sorted order, re-sorting only after new fields appear.
+
+        Fields are only ever added, so an unchanged count means the cached
+        order is still current.
+
+        Args:
+            endpoint: Endpoint to list, or None for every discovered field
+
+        Returns:
+            Sorted list of field paths
+        """
+        paths = self.fields if endpoint is None else self.endpoint_fields.get(endpoint, set())
+        cached = self._sorted_cache.get(endpoint)
+        if cached is None or cached[0] != len(paths):
+            cached = self._sorted_cache[endpoint] = (len(paths), sorted(paths))
+        return cached[1]
 
     def analyze_response(self, data: Any, endpoint: str) -> int:
         """
@@ -230,7 +286,7 @@ class FieldDiscovery:
                 "field_count": len(field_paths),
                 "fields": [
                     self.fields[path].to_dict()
-                    for path in sorted(field_paths)
+                    for path in self._sorted_paths(endpoint)
                     if path in self.fields
                 ],
             }
@@ -249,7 +305,7 @@ class FieldDiscovery:
                 },
             },
             "endpoints": endpoints_data,
-            "all_fields": [self.fields[path].to_dict() for path in sorted(self.fields.keys())],
+            "all_fields": [self.fields[path].to_dict() for path in self._sorted_paths()],
         }
 
     def get_fields_by_type(self) -> Dict[str, List[str]]:
@@ -283,22 +339,22 @@ class FieldDiscovery:
 
         # Fields per endpoint
         print("\nFields per endpoint:")
-        for endpoint, paths in sorted(self.endpoint_fields.items()):
-            print(f"  {endpoint}: {len(paths)} fields")
+        for endpoint, field_paths in sorted(self.endpoint_fields.items()):
+            print(f"  {endpoint}: {len(field_paths)} fields")
 
         print("\n" + "-" * 60)
         print("Detailed Field List")
         print("-" * 60)
 
-        for endpoint, paths in sorted(self.endpoint_fields.items()):
+        for endpoint, field_paths in sorted(self.endpoint_fields.items()):
             print(f"\n[{endpoint}]")
-            for path in sorted(paths)[:20]:  # Show first 20 per endpoint
+            for path in self._sorted_paths(endpoint)[:20]:  # Show first 20 per endpoint
                 field = self.fields.get(path)
                 if field:
                     nullable = " (nullable)" if field.nullable else ""
                     print(f"  {path}: {field.field_type}{nullable}")
-            if len(paths) > 20:
-                print(f"  ... and {len(paths) - 20} more fields")
+            if len(field_paths) > 20:
+                print(f"  ... and {len(field_paths) - 20} more fields")
 
 
 def save_inventory(inventory: dict, output_path: str) -> None:
@@ -5,13 +5,16 @@ Merges and processes event data into a consolidated Time Trials report.
 """
 
 import csv
-import json
+import functools
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple
+from operator import itemgetter
+from typing import Any, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+
+from hpde_analytics_cli.utils import _loads, run_timestamp
 
 try:
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
     from openpyxl.utils import get_column_letter
 
@@ -19,6 +22,153 @@ try:
 except ImportError:
     OPENPYXL_AVAILABLE = False
 
+# Columns the report reads from entrylist.csv and attendees.csv, in record order
+_CSV_COLUMNS = (
+    "firstName",
+    "lastName",
+    "segment",
+    "group",
+    "class",
+    "make",
+    "model",
+    "year",
+    "vehicleNumber",
+    "color",
+    "sponsor",
+    "email",
+    "memberId",
+    "status",
+)
+
+
+class _CsvRecord(NamedTuple):
+    """A CSV row reduced to the stripped _CSV_COLUMNS, followed by the row's driver key."""
+
+    firstName: str
+    lastName: str
+    segment: str
+    group: str
+    tt_class: str  # the "class" column
+    make: str
+    model: str
+    year: str
+    vehicleNumber: str
+    color: str
+    sponsor: str
+    email: str
+    memberId: str
+    status: str
+    key: str
+
+
+# Output buffer size for saving the report workbook
+SAVE_BUFFER_SIZE = 1024 * 1024
+
+# Report columns, in order
+_REPORT_HEADERS = [
+    "First Name",
+    "Last Name",
+    "Email",
+    "Member ID",
+    "Class",
+    "Class Group",
+    "Vehicle #",
+    "Vehicle",
+    "Color",
+    "Tire",
+    "Sponsor",
+    "Days (TT)",
+    "Day Count",
+    "Instructor",
+    "AYCE",
+    "Participation Type",
+    "Status",
+]
+
+# Participation flags returned by ReportGenerator._classify_group
+_GROUP_TIME_TRIALS = 1
+_GROUP_INSTRUCTOR = 2
+_GROUP_ADVANCED_HPDE = 4
+
+
+# Class group by first letter of the lowercased class, with the prefix it must start with
+_CLASS_GROUP_PREFIXES = {
+    "m": ("max", "Max"),
+    "s": ("sport", "Sport"),
+    "t": ("tuner", "Tuner"),
+    "u": ("unlimited", "Unlimited"),
+}
+
+# Event days as bits of a driver's day mask
+_DAY_BITS = {"Friday": 1, "Saturday": 2, "Sunday": 4}
+_DAY_NAMES = {bit: day for day, bit in _DAY_BITS.items()}
+
+# (days string, day count) indexed by a day mask
+_DAYS_TABLE = (
+    ("", 0),
+    ("Friday", 1),
+    ("Saturday", 1),
+    ("Fri/Sat", 2),
+    ("Sunday", 1),
+    ("Fri/Sun", 2),
+    ("Sat/Sun", 2),
+    ("All 3", 3),
+)
+
+
+class DriverRecord:
+    """A driver's merged entry, attendee, and tire data for the report."""
+
+    __slots__ = (
+        "firstName",
+        "lastName",
+        "tt_class",
+        "make",
+        "model",
+        "year",
+        "vehicleNumber",
+        "color",
+        "sponsor",
+        "tireBrand",
+        "is_tt",
+        "is_instructor",
+        "is_advanced_hpde",
+        "days_tt_mask",
+        "days_instructor_mask",
+        "days_advanced_mask",
+        "email",
+        "memberId",
+        "status",
+    )
+
+    def __init__(self, first_name: str, last_name: str):
+        """
+        Initialize a driver record with default values.
+
+        Args:
+            first_name: Driver's first name
+            last_name: Driver's last name
+        """
+        self.firstName = first_name
+        self.lastName = last_name
+        self.tt_class = ""
+        self.make = ""
+        self.model = ""
+        self.year = ""
+        self.vehicleNumber = ""
+        self.color = ""
+        self.sponsor = ""
+        self.tireBrand = ""
+        self.is_tt = False
+        self.is_instructor = False
+        self.is_advanced_hpde = False
+        self.days_tt_mask = 0
+        self.days_instructor_mask = 0
+        self.days_advanced_mask = 0
+        self.email = ""
+        self.memberId = ""
+        self.status = ""
+
 
 class ReportGenerator:
     """Generates consolidated Time Trials reports from MSR data."""
@@ -36,62 +186,111 @@ class ReportGenerator:
         self.assignments_file = os.path.join(export_dir, "assignments.csv")
         self.assignments_json_file = os.path.join(export_dir, "assignments.json")
 
-    def _read_csv(self, filepath: str) -> List[Dict]:
-        """Read a CSV file into a list of dictionaries."""
-        rows = []
-        with open(filepath, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
+    def _iter_csv(self, filepath: str) -> Iterator[_CsvRecord]:
+        """
+        Stream a CSV file as records holding only the columns the report uses.
+
+        Values are stripped once here, and each record carries its driver key,
+        so later steps use them as-is. Columns missing from the file, and
+        cells missing from short rows, read as empty strings.
+        """
+        with open(filepath, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+
+            width = len(header)
+            index = {name: i for i, name in enumerate(header)}
+            # Missing columns point one past the header, at an appended empty cell
+            pick = itemgetter(*(index.get(name, width) for name in _CSV_COLUMNS))
+            padding = [""] * width
+            make_record = _CsvRecord._make
+
             for row in reader:
-                rows.append(row)
-        return rows
+                if not row:
+                    continue
+                length = len(row)
+                if length < width:
+                    row.extend(padding[length:])
+                elif length > width:
+                    del row[width:]
+                row.append("")
+                values = [value.strip() for value in pick(row)]
+                values.append(f"{values[0].lower()}|{values[1].lower()}")
+                yield make_record(values)
 
     def _read_json(self, filepath: str) -> Any:
         """Read a JSON file."""
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(filepath, "rb") as f:
+            return _loads(f.read())
 
     def _get_driver_key(self, row: Dict) -> str:
         """Create a unique key for a driver based on first and last name."""
-        first = (row.get("firstName") or "").strip().lower()
-        last = (row.get("lastName") or "").strip().lower()
-        return f"{first}|{last}"
+        return self._name_key(row.get("firstName") or "", row.get("lastName") or "")
 
-    def _parse_segment(self, segment: str) -> Optional[str]:
-        """Extract the day from segment (Friday/Saturday/Sunday)."""
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _name_key(first: str, last: str) -> str:
+        """Create a driver key from raw first and last name values."""
+        return f"{first.strip().lower()}|{last.strip().lower()}"
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _classify_segment(segment: str) -> Tuple[bool, int]:
+        """
+        Classify a segment in one pass.
+
+        Returns:
+            Tuple of (worker-only entry, day bit of the segment or 0)
+        """
         if not segment:
-            return None
+            return True, 0
         segment_lower = segment.lower()
+        is_worker = "workers" in segment_lower
         if "friday" in segment_lower:
-            return "Friday"
+            return is_worker, _DAY_BITS["Friday"]
         elif "saturday" in segment_lower:
-            return "Saturday"
+            return is_worker, _DAY_BITS["Saturday"]
         elif "sunday" in segment_lower:
-            return "Sunday"
-        return None
+            return is_worker, _DAY_BITS["Sunday"]
+        return is_worker, 0
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _classify_group(group: str) -> int:
+        """Classify a group as a bitmask of the _GROUP_* participation flags."""
+        if not group:
+            return 0
+        group_lower = group.lower()
+        flags = 0
+        if "time trials" in group_lower:
+            flags |= _GROUP_TIME_TRIALS
+        if "instructing" in group_lower:
+            flags |= _GROUP_INSTRUCTOR
+        if "advanced hpde" in group_lower:
+            flags |= _GROUP_ADVANCED_HPDE
+        return flags
+
+    def _parse_segment(self, segment: str) -> Optional[str]:
+        """Extract the day from segment (Friday/Saturday/Sunday)."""
+        return _DAY_NAMES.get(self._classify_segment(segment)[1])
 
     def _is_time_trials(self, group: str) -> bool:
         """Check if this is a Time Trials entry."""
-        if not group:
-            return False
-        return "time trials" in group.lower()
+        return bool(self._classify_group(group) & _GROUP_TIME_TRIALS)
 
     def _is_instructor(self, group: str) -> bool:
         """Check if this is an Instructing entry."""
-        if not group:
-            return False
-        return "instructing" in group.lower()
+        return bool(self._classify_group(group) & _GROUP_INSTRUCTOR)
 
     def _is_advanced_hpde(self, group: str) -> bool:
         """Check if this is an Advanced HPDE entry."""
-        if not group:
-            return False
-        return "advanced hpde" in group.lower()
+        return bool(self._classify_group(group) & _GROUP_ADVANCED_HPDE)
 
     def _is_worker_only(self, segment: str) -> bool:
         """Check if this is a worker-only entry (not a track event)."""
-        if not segment:
-            return True
-        return "workers" in segment.lower()
+        return self._classify_segment(segment)[0]
 
     def _get_participation_type(self, is_instructor: bool, is_ayce: bool) -> str:
         """
@@ -127,235 +326,171 @@ class ReportGenerator:
         else:
             return ""
 
-    def _format_days_string(self, days_tt: Set[str]) -> Tuple[str, int]:
+    def _format_days_string(self, days_tt_mask: int) -> Tuple[str, int]:
         """
         Format days participation into display string and count.
 
         Returns:
             Tuple of (formatted days string, day count)
         """
-        has_fri = "Friday" in days_tt
-        has_sat = "Saturday" in days_tt
-        has_sun = "Sunday" in days_tt
-        day_count = sum([has_fri, has_sat, has_sun])
-
-        if day_count == 3:
-            return "All 3", day_count
-        if day_count == 2:
-            if has_fri and has_sat:
-                return "Fri/Sat", day_count
-            if has_fri and has_sun:
-                return "Fri/Sun", day_count
-            return "Sat/Sun", day_count
-        if day_count == 1:
-            if has_fri:
-                return "Friday", day_count
-            if has_sat:
-                return "Saturday", day_count
-            return "Sunday", day_count
-        return "", day_count
-
-    def _format_vehicle_string(self, driver: Dict) -> str:
+        return _DAYS_TABLE[days_tt_mask]
+
+    def _format_vehicle_string(self, driver: DriverRecord) -> str:
         """Combine year, make, model into single vehicle string."""
-        parts = []
-        if driver["year"]:
-            parts.append(str(driver["year"]))
-        if driver["make"]:
-            parts.append(driver["make"])
-        if driver["model"]:
-            parts.append(driver["model"])
-        return " ".join(parts)
+        # Values come from the CSVs, so they are already strings
+        return " ".join(filter(None, (driver.year, driver.make, driver.model)))
 
-    def _write_driver_row(
-        self, ws, row_num: int, driver: Dict, thin_border, center_cols: List[int]
-    ) -> None:
-        """Write a single driver's data row to the worksheet."""
+    def _build_driver_row(self, driver: DriverRecord, col_widths: List[int]) -> List[str]:
+        """Build a single driver's row values, widening col_widths to fit them."""
         # Format days and get count
-        days_str, day_count = self._format_days_string(driver["days_tt"])
+        days_str, day_count = self._format_days_string(driver.days_tt_mask)
 
         # Calculate derived values
-        is_ayce = driver["is_tt"] and driver["is_advanced_hpde"]
-        class_group = self._get_class_group(driver["class"])
+        is_ayce = driver.is_tt and driver.is_advanced_hpde
+        class_group = self._get_class_group(driver.tt_class)
         day_count_str = self._get_day_count(day_count)
-        participation_type = self._get_participation_type(driver["is_instructor"], is_ayce)
+        participation_type = self._get_participation_type(driver.is_instructor, is_ayce)
         vehicle = self._format_vehicle_string(driver)
 
         # Build row data
         row_data = [
-            driver["firstName"],
-            driver["lastName"],
-            driver["email"],
-            driver["memberId"],
-            driver["class"],
+            driver.firstName,
+            driver.lastName,
+            driver.email,
+            driver.memberId,
+            driver.tt_class,
             class_group,
-            driver["vehicleNumber"],
+            driver.vehicleNumber,
             vehicle,
-            driver["color"],
-            driver["tireBrand"],
-            driver["sponsor"],
+            driver.color,
+            driver.tireBrand,
+            driver.sponsor,
             days_str,
             day_count_str,
-            "Yes" if driver["is_instructor"] else "No",
+            "Yes" if driver.is_instructor else "No",
             "Yes" if is_ayce else "No",
             participation_type,
-            driver["status"],
+            driver.status,
         ]
 
-        # Write cells with formatting
+        for col, value in enumerate(row_data):
+            if value:
+                length = len(str(value))
+                if length > col_widths[col]:
+                    col_widths[col] = length
+        return row_data
+
+    def _write_driver_row(
+        self, ws, row_data: List[str], thin_border, center_alignment, center_cols: FrozenSet[int]
+    ) -> None:
+        """Append a single driver's data row to the worksheet."""
+        cells = []
         for col, value in enumerate(row_data, 1):
-            cell = ws.cell(row=row_num, column=col, value=value)
+            cell = WriteOnlyCell(ws, value=value)
             cell.border = thin_border
             if col in center_cols:
-                cell.alignment = Alignment(horizontal="center")
+                cell.alignment = center_alignment
+            cells.append(cell)
+        ws.append(cells)
 
-    def _build_tire_lookup(self) -> Dict[str, str]:
-        """Build lookup dictionary for tire brands from assignments JSON."""
-        tire_lookup: Dict[str, str] = {}
+    def _load_assignments(self) -> List[Dict]:
+        """Read the assignments list from assignments JSON, if it was exported."""
         if not os.path.exists(self.assignments_json_file):
-            return tire_lookup
+            return []
+        return self._read_json(self.assignments_json_file).get("assignments", [])
 
-        assignments_data = self._read_json(self.assignments_json_file)
-        for assignment in assignments_data.get("assignments", []):
-            key = self._get_driver_key(assignment)
-            group = assignment.get("group", "")
-            tire = assignment.get("tireBrand", "")
+    def _apply_tire_brands(self, drivers: Dict[str, DriverRecord], assignments: List[Dict]) -> None:
+        """Copy Time Trials tire brands from assignments onto matching drivers."""
+        for assignment in assignments:
+            tire = assignment.get("tireBrand")
             # Only capture tire from Time Trials entries
-            if key and key != "|" and self._is_time_trials(group) and tire:
-                tire_lookup[key] = tire
-
-        return tire_lookup
-
-    def _build_attendee_lookup(self, attendees: List[Dict]) -> Dict[str, Dict]:
-        """Build lookup dictionary for attendee data."""
-        attendee_lookup = {}
-        for att in attendees:
-            key = self._get_driver_key(att)
-            if key and key != "|":
-                attendee_lookup[key] = att
-        return attendee_lookup
-
-    def _initialize_driver_record(self, entry: Dict) -> Dict:
-        """Initialize a new driver record with default values."""
-        return {
-            "firstName": entry.get("firstName", "").strip(),
-            "lastName": entry.get("lastName", "").strip(),
-            "class": "",
-            "make": "",
-            "model": "",
-            "year": "",
-            "vehicleNumber": "",
-            "color": "",
-            "sponsor": "",
-            "tireBrand": "",
-            "is_tt": False,
-            "is_instructor": False,
-            "is_advanced_hpde": False,
-            "days_tt": set(),
-            "days_instructor": set(),
-            "days_advanced": set(),
-            "email": "",
-            "memberId": "",
-            "status": "",
-        }
-
-    def _update_driver_with_tt_data(self, driver: Dict, entry: Dict, day: Optional[str]) -> None:
+            if not tire or not self._is_time_trials(assignment.get("group", "")):
+                continue
+            driver = drivers.get(self._get_driver_key(assignment))
+            if driver is not None:
+                driver.tireBrand = tire
+
+    def _apply_attendee_data(self, drivers: Dict[str, DriverRecord]) -> None:
+        """Stream attendees.csv, copying contact and status data onto matching drivers."""
+        for att in self._iter_csv(self.attendees_file):
+            driver = drivers.get(att.key)
+            if driver is not None:
+                driver.email = att.email
+                driver.memberId = att.memberId
+                driver.status = att.status
+
+    def _update_driver_with_tt_data(
+        self, driver: DriverRecord, entry: _CsvRecord, day: int
+    ) -> None:
         """Update driver record with Time Trials data."""
-        driver["is_tt"] = True
-        if day:
-            driver["days_tt"].add(day)
+        driver.is_tt = True
+        driver.days_tt_mask |= day
         # Capture vehicle info from TT entry
-        if entry.get("class"):
-            driver["class"] = entry.get("class", "")
-        if entry.get("make"):
-            driver["make"] = entry.get("make", "")
-        if entry.get("model"):
-            driver["model"] = entry.get("model", "")
-        if entry.get("year"):
-            driver["year"] = entry.get("year", "")
-        if entry.get("vehicleNumber"):
-            driver["vehicleNumber"] = entry.get("vehicleNumber", "")
-        if entry.get("color"):
-            driver["color"] = entry.get("color", "")
-        if entry.get("sponsor"):
-            driver["sponsor"] = entry.get("sponsor", "")
-
-    def _process_entry(self, entry: Dict, drivers: Dict[str, Dict]) -> None:
+        if entry.tt_class:
+            driver.tt_class = entry.tt_class
+        if entry.make:
+            driver.make = entry.make
+        if entry.model:
+            driver.model = entry.model
+        if entry.year:
+            driver.year = entry.year
+        if entry.vehicleNumber:
+            driver.vehicleNumber = entry.vehicleNumber
+        if entry.color:
+            driver.color = entry.color
+        if entry.sponsor:
+            driver.sponsor = entry.sponsor
+
+    def _process_entry(self, entry: _CsvRecord, drivers: Dict[str, DriverRecord]) -> None:
         """Process a single entry and update driver records."""
         # Skip worker-only entries
-        if self._is_worker_only(entry.get("segment", "")):
+        is_worker, day = self._classify_segment(entry.segment)
+        if is_worker:
             return
 
-        driver_key = self._get_driver_key(entry)
-        if not driver_key or driver_key == "|":
+        driver_key = entry.key
+        if driver_key == "|":
             return
 
-        group = entry.get("group", "")
-        segment = entry.get("segment", "")
-        day = self._parse_segment(segment)
+        flags = self._classify_group(entry.group)
 
         # Initialize driver record if new
-        if driver_key not in drivers:
-            drivers[driver_key] = self._initialize_driver_record(entry)
-
-        driver = drivers[driver_key]
+        driver = drivers.get(driver_key)
+        if driver is None:
+            driver = drivers[driver_key] = DriverRecord(entry.firstName, entry.lastName)
 
         # Track participation types
-        if self._is_time_trials(group):
+        if flags & _GROUP_TIME_TRIALS:
             self._update_driver_with_tt_data(driver, entry, day)
 
-        if self._is_instructor(group):
-            driver["is_instructor"] = True
-            if day:
-                driver["days_instructor"].add(day)
+        if flags & _GROUP_INSTRUCTOR:
+            driver.is_instructor = True
+            driver.days_instructor_mask |= day
 
-        if self._is_advanced_hpde(group):
-            driver["is_advanced_hpde"] = True
-            if day:
-                driver["days_advanced"].add(day)
+        if flags & _GROUP_ADVANCED_HPDE:
+            driver.is_advanced_hpde = True
+            driver.days_advanced_mask |= day
 
-    def _enrich_drivers_with_metadata(
-        self, drivers: Dict[str, Dict], attendee_lookup: Dict, tire_lookup: Dict
-    ) -> None:
-        """Add attendee info and tire data to driver records."""
-        for driver_key, driver in drivers.items():
-            if driver_key in attendee_lookup:
-                att = attendee_lookup[driver_key]
-                driver["email"] = att.get("email", "")
-                driver["memberId"] = att.get("memberId", "")
-                driver["status"] = att.get("status", "")
-            if driver_key in tire_lookup:
-                driver["tireBrand"] = tire_lookup[driver_key]
-
-    def _create_workbook_with_headers(self) -> Tuple:
-        """Create Excel workbook with formatted headers."""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Time Trials Report"
-
-        headers = [
-            "First Name",
-            "Last Name",
-            "Email",
-            "Member ID",
-            "Class",
-            "Class Group",
-            "Vehicle #",
-            "Vehicle",
-            "Color",
-            "Tire",
-            "Sponsor",
-            "Days (TT)",
-            "Day Count",
-            "Instructor",
-            "AYCE",
-            "Participation Type",
-            "Status",
-        ]
+    def _create_workbook_with_headers(self, col_widths: List[int]) -> Tuple:
+        """
+        Create a write-only Excel workbook with sized columns and formatted headers.
+
+        Write-only sheets emit column widths and frozen panes ahead of the
+        first row, so both are applied before the header is appended.
+
+        Args:
+            col_widths: Longest value length in each column
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Time Trials Report")
+        self._auto_adjust_column_widths(ws, col_widths)
+        ws.freeze_panes = "A2"
 
         # Style settings
         header_font = Font(bold=True, color="FFFFFF")
         header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
         header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        center_alignment = Alignment(horizontal="center")
         thin_border = Border(
             left=Side(style="thin"),
             right=Side(style="thin"),
@@ -364,27 +499,27 @@ class ReportGenerator:
         )
 
         # Write headers
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
+        header_cells = []
+        for header in _REPORT_HEADERS:
+            cell = WriteOnlyCell(ws, value=header)
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = header_alignment
             cell.border = thin_border
+            header_cells.append(cell)
+        ws.append(header_cells)
 
-        return wb, ws, headers, thin_border
+        return wb, ws, thin_border, center_alignment
 
-    def _auto_adjust_column_widths(self, ws, headers: List[str], num_rows: int) -> None:
-        """Auto-adjust column widths based on content."""
-        for col in range(1, len(headers) + 1):
-            max_length = len(headers[col - 1])
-            for row in range(2, num_rows + 2):
-                cell_value = ws.cell(row=row, column=col).value
-                if cell_value:
-                    max_length = max(max_length, len(str(cell_value)))
+    def _auto_adjust_column_widths(self, ws, col_widths: List[int]) -> None:
+        """Size columns from the longest value written to each."""
+        for col, max_length in enumerate(col_widths, 1):
             adjusted_width = min(max_length + 2, 50)
             ws.column_dimensions[get_column_letter(col)].width = adjusted_width
 
-    def _get_class_group(self, tt_class: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _get_class_group(tt_class: str) -> str:
         """
         Determine class grouping for pivot table analysis.
 
@@ -400,14 +535,9 @@ class ReportGenerator:
 
         class_lower = tt_class.lower().strip()
 
-        if class_lower.startswith("max"):
-            return "Max"
-        if class_lower.startswith("sport"):
-            return "Sport"
-        if class_lower.startswith("tuner"):
-            return "Tuner"
-        if class_lower.startswith("unlimited"):
-            return "Unlimited"
+        prefix_group = _CLASS_GROUP_PREFIXES.get(class_lower[:1])
+        if prefix_group and class_lower.startswith(prefix_group[0]):
+            return prefix_group[1]
         return "Other"
 
     def generate_tt_report(self, output_path: Optional[str] = None) -> Tuple[str, int]:
@@ -428,45 +558,45 @@ class ReportGenerator:
                 "openpyxl is required for Excel export. Install with: pip install openpyxl"
             )
 
-        # Read and prepare data
-        entrylist = self._read_csv(self.entrylist_file)
-        attendees = self._read_csv(self.attendees_file)
-        tire_lookup = self._build_tire_lookup()
-        attendee_lookup = self._build_attendee_lookup(attendees)
-
-        # Process entries - group by driver
-        drivers: Dict[str, Dict] = {}
-        for entry in entrylist:
+        # Process entries as they are read - group by driver. A row identical
+        # to the one before it would only reapply the same values.
+        drivers: Dict[str, DriverRecord] = {}
+        previous_entry = None
+        for entry in self._iter_csv(self.entrylist_file):
+            if entry == previous_entry:
+                continue
+            previous_entry = entry
             self._process_entry(entry, drivers)
 
         # Filter to only Time Trials participants
-        tt_drivers = {k: v for k, v in drivers.items() if v["is_tt"]}
+        tt_drivers = {k: v for k, v in drivers.items() if v.is_tt}
 
         # Add attendee info and tire data
-        self._enrich_drivers_with_metadata(tt_drivers, attendee_lookup, tire_lookup)
-
-        # Create Excel workbook with headers
-        wb, ws, headers, thin_border = self._create_workbook_with_headers()
+        self._apply_attendee_data(tt_drivers)
+        self._apply_tire_brands(tt_drivers, self._load_assignments())
 
-        # Sort drivers and write data rows
+        # Sort drivers and build data rows
         sorted_drivers = sorted(
-            tt_drivers.values(), key=lambda d: (d["lastName"].lower(), d["firstName"].lower())
+            tt_drivers.values(), key=lambda d: (d.lastName.lower(), d.firstName.lower())
         )
 
-        center_cols = [6, 12, 13, 14, 15, 16]
-        for row_num, driver in enumerate(sorted_drivers, 2):
-            self._write_driver_row(ws, row_num, driver, thin_border, center_cols)
+        col_widths = [len(header) for header in _REPORT_HEADERS]
+        rows = [self._build_driver_row(driver, col_widths) for driver in sorted_drivers]
 
-        # Format worksheet
-        self._auto_adjust_column_widths(ws, headers, len(sorted_drivers))
-        ws.freeze_panes = "A2"
+        # Create Excel workbook with headers, then stream the data rows
+        wb, ws, thin_border, center_alignment = self._create_workbook_with_headers(col_widths)
+
+        center_cols = frozenset((6, 12, 13, 14, 15, 16))
+        for row_data in rows:
+            self._write_driver_row(ws, row_data, thin_border, center_alignment, center_cols)
 
         # Set output path
         if output_path is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = os.path.join(self.export_dir, f"tt_report_{timestamp}.xlsx")
+            output_path = os.path.join(self.export_dir, f"tt_report_{run_timestamp()}.xlsx")
 
-        wb.save(output_path)
+        # The zip writer emits many small parts; buffer them into large writes
+        with open(output_path, "wb", buffering=SAVE_BUFFER_SIZE) as f:
+            wb.save(f)
 
         return output_path, len(sorted_drivers)
 
@@ -10,6 +10,8 @@ import pytest
 # Add the package root to the path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from hpde_analytics_cli.auth.oauth import refresh_env  # noqa: E402
+
 
 @pytest.fixture(autouse=True)
 def clean_env():
@@ -17,6 +19,7 @@ def clean_env():
     # Store original values
     original_key = os.environ.get("MSR_CONSUMER_KEY")
     original_secret = os.environ.get("MSR_CONSUMER_SECRET")
+    refresh_env()
 
     yield
 
@@ -30,3 +33,5 @@ def clean_env():
         os.environ["MSR_CONSUMER_SECRET"] = original_secret
     elif "MSR_CONSUMER_SECRET" in os.environ:
         del os.environ["MSR_CONSUMER_SECRET"]
+
+    refresh_env()
@@ -5,6 +5,7 @@ Tests for the API client module.
 from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
+import requests
 
 from hpde_analytics_cli.api.client import (
     APIError,
@@ -37,6 +38,12 @@ class TestAPIError:
 class TestMSRClient:
     """Tests for MSRClient class."""
 
+    @pytest.fixture(autouse=True)
+    def mocked_json(self):
+        """Parse via response.json() so tests can mock the decoded body directly."""
+        with patch.object(MSRClient, "_parse_json", lambda self, response: response.json()):
+            yield
+
     @pytest.fixture
     def mock_oauth(self):
         """Create a mock OAuth instance."""
@@ -72,6 +79,32 @@ class TestMSRClient:
         assert session == mock_session
         mock_oauth.get_oauth_session.assert_called_once()
 
+    def test_context_manager_leaves_session_open(self, client, mock_oauth):
+        """Test that the with-block opens the session but leaves closing it to the handler."""
+        mock_session = MagicMock()
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        with client as entered:
+            assert entered is client
+            mock_oauth.get_oauth_session.assert_called_once()
+
+        mock_session.close.assert_not_called()
+        mock_oauth.close_session.assert_not_called()
+
+    def test_close_drops_cached_responses(self, client, mock_oauth):
+        """Test that close() clears the client's own caches without closing the session."""
+        mock_session = MagicMock()
+        mock_oauth.get_oauth_session.return_value = mock_session
+        client._cache[("GET", "url")] = (0.0, {})
+        client._etags[("GET", "url")] = ("etag", {})
+
+        client.close()
+        client.close()
+
+        assert client._cache == {}
+        assert client._etags == {}
+        mock_session.close.assert_not_called()
+
     def test_request_adds_json_suffix(self, client, mock_oauth):
         """Test that .json suffix is added to endpoint."""
         mock_session = MagicMock()
@@ -87,6 +120,14 @@ class TestMSRClient:
         call_args = mock_session.get.call_args
         assert call_args[0][0].endswith(".json")
 
+    def test_canonical_url_is_memoized(self, client):
+        """Test that canonical URLs gain the .json suffix and are reused."""
+        url = client._canonical_url("/rest/me")
+
+        assert url == "https://api.motorsportreg.com/rest/me.json"
+        assert client._canonical_url("/rest/me") is url
+        assert client._canonical_url("/rest/me.json") == url
+
     def test_request_unwraps_response(self, client, mock_oauth):
         """Test that MSR response envelope is unwrapped."""
         mock_session = MagicMock()
@@ -174,6 +215,240 @@ class TestMSRClient:
         assert exc_info.value.status_code == 404
         assert "not found" in str(exc_info.value).lower()
 
+    def test_request_handles_unmapped_client_error(self, client, mock_oauth):
+        """Test that other 4xx errors raise a generic, non-retried error."""
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 400
+        mock_response.text = "Bad Request"
+        mock_session.get.return_value = mock_response
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        with pytest.raises(APIError) as exc_info:
+            client._request("GET", "/rest/me.json")
+
+        assert exc_info.value.status_code == 400
+        assert str(exc_info.value) == "Request failed with status 400"
+        assert mock_session.get.call_count == 1
+
+    @patch("hpde_analytics_cli.api.client.time.sleep")
+    def test_request_retries_on_429(self, mock_sleep, client, mock_oauth):
+        """Test that 429 responses are retried and honor Retry-After."""
+        mock_session = MagicMock()
+        rate_limited = MagicMock()
+        rate_limited.status_code = 429
+        rate_limited.headers = {"Retry-After": "2"}
+        ok_response = MagicMock()
+        ok_response.status_code = 200
+        ok_response.json.return_value = {"response": {"ok": True}}
+        mock_session.get.side_effect = [rate_limited, ok_response]
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        result = client._request("GET", "/rest/me.json")
+
+        assert result == {"ok": True}
+        mock_sleep.assert_called_once_with(2.0)
+
+    @patch("hpde_analytics_cli.api.client.time.sleep")
+    def test_request_raises_after_exhausting_retries(self, mock_sleep, client, mock_oauth):
+        """Test that a persistent server error raises once retries are exhausted."""
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 503
+        mock_response.headers = {}
+        mock_response.text = "Unavailable"
+        mock_session.get.return_value = mock_response
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        with pytest.raises(APIError) as exc_info:
+            client._request("GET", "/rest/me.json", retries=2)
+
+        assert exc_info.value.status_code == 503
+        assert mock_session.get.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch("hpde_analytics_cli.api.client.time.sleep")
+    def test_request_retries_network_errors(self, mock_sleep, client, mock_oauth):
+        """Test that network errors are retried and the final error is chained."""
+        mock_session = MagicMock()
+        network_error = requests.exceptions.ConnectionError("connection reset")
+        mock_session.get.side_effect = network_error
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        with pytest.raises(APIError) as exc_info:
+            client._request("GET", "/rest/me.json", retries=2)
+
+        assert str(exc_info.value) == "Request failed: connection reset"
+        assert exc_info.value.__cause__ is network_error
+        assert mock_session.get.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    def test_request_propagates_unexpected_errors(self, client, mock_oauth):
+        """Test that non-network errors are not retried or wrapped."""
+        mock_session = MagicMock()
+        mock_session.get.side_effect = RuntimeError("bug")
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        with pytest.raises(RuntimeError):
+            client._request("GET", "/rest/me.json")
+
+        assert mock_session.get.call_count == 1
+
+    def test_request_invalid_json_raises_api_error(self, client, mock_oauth):
+        """Test that an unparseable 200 body raises APIError without retrying."""
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "<html>"
+        mock_response.json.side_effect = ValueError("Expecting value")
+        mock_session.get.return_value = mock_response
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        with pytest.raises(APIError) as exc_info:
+            client._request("GET", "/rest/me.json")
+
+        assert "Invalid JSON" in str(exc_info.value)
+        assert mock_session.get.call_count == 1
+
+    def test_retry_delay_uses_bounded_exponential_backoff(self, client):
+        """Test that backoff delays stay within the jittered exponential window."""
+        for attempt in range(6):
+            delay = client._get_retry_delay(attempt)
+            ceiling = min(client.retry_delay * (2**attempt), client.max_retry_delay)
+            assert client.retry_delay <= delay <= ceiling
+
+    def test_retry_delay_caps_retry_after(self, client):
+        """Test that an oversized Retry-After header is capped."""
+        response = MagicMock()
+        response.headers = {"Retry-After": "3600"}
+
+        assert client._get_retry_delay(0, response) == client.max_retry_delay
+
+    def test_retry_delay_ignores_http_date_retry_after(self, client):
+        """Test that a non-numeric Retry-After falls back to backoff."""
+        response = MagicMock()
+        response.headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+
+        delay = client._get_retry_delay(0, response)
+
+        assert abs(delay - client.retry_delay) < 0.001
+
+    def test_get_me_is_cached(self, client, mock_oauth):
+        """Test that repeated get_me calls within the TTL hit the cache."""
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": {"firstName": "Test"}}
+        mock_response.content = b'{"response": {"firstName": "Test"}}'
+        mock_session.get.return_value = mock_response
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        first = client.get_me()
+        first["firstName"] = "Mutated"
+        second = client.get_me()
+
+        assert second == {"firstName": "Test"}
+        assert mock_session.get.call_count == 1
+
+    def test_cache_hit_skips_session(self, client, mock_oauth):
+        """Test that a cache hit never touches the OAuth session."""
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": {}}
+        mock_response.content = b'{"response": {}}'
+        mock_session.get.return_value = mock_response
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        client.get_me()
+        with patch.object(client, "_get_session") as mock_get_session:
+            client.get_me()
+
+        mock_get_session.assert_not_called()
+
+    def test_cache_expires_after_ttl(self, client, mock_oauth):
+        """Test that cached responses are refetched once the TTL elapses."""
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": {"events": []}}
+        mock_session.get.return_value = mock_response
+        mock_oauth.get_oauth_session.return_value = mock_session
+        client.cache_ttl["calendar"] = 60.0
+
+        with patch("hpde_analytics_cli.api.client.time.monotonic") as mock_clock:
+            mock_clock.return_value = 0.0
+            client.get_organization_calendar()
+            mock_clock.return_value = 61.0
+            client.get_organization_calendar()
+
+        assert mock_session.get.call_count == 2
+
+    def test_invalidate_drops_cached_endpoint(self, client, mock_oauth):
+        """Test that invalidate() forces the next call to refetch."""
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": {}}
+        mock_session.get.return_value = mock_response
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        client.get_me()
+        client.invalidate("/rest/me")
+        client.get_me()
+
+        assert mock_session.get.call_count == 2
+
+    def test_conditional_get_reuses_data_on_304(self, client, mock_oauth):
+        """Test that a stored ETag is sent and a 304 returns the previous data."""
+        mock_session = MagicMock()
+        first_response = MagicMock()
+        first_response.status_code = 200
+        first_response.headers = {"ETag": '"abc123"'}
+        first_response.json.return_value = {"response": {"assignments": [{"id": "a-1"}]}}
+        first_response.content = b'{"response": {"assignments": [{"id": "a-1"}]}}'
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        not_modified.headers = {}
+        mock_session.get.side_effect = [first_response, not_modified]
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        first = client.get_event_entrylist("event-123")
+        second = client.get_event_entrylist("event-123")
+
+        assert second == first == {"assignments": [{"id": "a-1"}]}
+        assert second is not first
+        assert "If-None-Match" not in mock_session.get.call_args_list[0][1]["headers"]
+        assert mock_session.get.call_args_list[1][1]["headers"]["If-None-Match"] == '"abc123"'
+
+    def test_304_without_stored_etag_is_an_error(self, client, mock_oauth):
+        """Test that an unexpected 304 is not treated as success."""
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 304
+        mock_response.headers = {}
+        mock_session.get.return_value = mock_response
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        with pytest.raises(APIError) as exc_info:
+            client.get_event_entrylist("event-123")
+
+        assert exc_info.value.status_code == 304
+
+    def test_event_endpoints_are_not_cached(self, client, mock_oauth):
+        """Test that event endpoints are always fetched fresh."""
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": {"assignments": []}}
+        mock_session.get.return_value = mock_response
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        client.get_event_entrylist("event-123")
+        client.get_event_entrylist("event-123")
+
+        assert mock_session.get.call_count == 2
+
     def test_request_unsupported_method(self, client, mock_oauth):
         """Test handling of unsupported HTTP method."""
         mock_session = MagicMock()
@@ -183,6 +458,21 @@ class TestMSRClient:
             client._request("DELETE", "/rest/me.json")
 
         assert "Unsupported HTTP method" in str(exc_info.value)
+        mock_session.delete.assert_not_called()
+
+    def test_request_post_sends_params_as_data(self, client, mock_oauth):
+        """Test that POST requests send params in the request body."""
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": {}}
+        mock_session.post.return_value = mock_response
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        client._request("post", "/rest/endpoint.json", params={"a": "1"})
+
+        assert mock_session.post.call_args[1]["data"] == {"a": "1"}
+        mock_session.get.assert_not_called()
 
     def test_get_me(self, client, mock_oauth):
         """Test get_me method."""
@@ -286,6 +576,151 @@ class TestMSRClient:
 
         assert "timing" in result
 
+    def test_get_all_endpoint_data_fetches_all_endpoints(self, client):
+        """Test that all endpoints are fetched and returned in stable order."""
+        with (
+            patch.object(client, "get_me", return_value={"id": "me"}),
+            patch.object(
+                client, "get_organization_calendar", return_value={"events": [{"id": "evt-1"}]}
+            ),
+            patch.object(
+                client, "get_event_entrylist", return_value={"assignments": []}
+            ) as entrylist,
+            patch.object(client, "get_event_attendees", return_value={"attendees": []}),
+            patch.object(client, "get_event_assignments", return_value={"assignments": []}),
+            patch.object(client, "get_timing_feed", return_value={"timing": []}),
+        ):
+            results = client.get_all_endpoint_data()
+
+        assert list(results.keys()) == [
+            "me",
+            "calendar",
+            "entrylist",
+            "attendees",
+            "assignments",
+            "timing",
+        ]
+        entrylist.assert_called_once_with("evt-1")
+
+    def test_get_all_endpoint_data_records_endpoint_errors(self, client):
+        """Test that a failing endpoint is recorded without aborting the others."""
+        with (
+            patch.object(client, "get_me", return_value={}),
+            patch.object(client, "get_organization_calendar", return_value={"events": []}),
+            patch.object(client, "get_event_entrylist", side_effect=APIError("boom")),
+            patch.object(client, "get_event_attendees", return_value={"attendees": []}),
+            patch.object(client, "get_event_assignments", return_value={}),
+            patch.object(client, "get_timing_feed", return_value={}),
+        ):
+            results = client.get_all_endpoint_data(event_id="evt-2")
+
+        assert results["entrylist"] == {"error": "boom"}
+        assert results["attendees"] == {"attendees": []}
+
+    def test_get_events_bulk_fetches_each_event(self, client):
+        """Test that bulk fetch returns per-event, per-endpoint results."""
+        with (
+            patch.object(client, "get_event_entrylist", side_effect=lambda e: {"event": e}),
+            patch.object(client, "get_event_attendees", side_effect=APIError("denied")),
+        ):
+            results = client.get_events_bulk(["e1", "e2"], endpoints=["entrylist", "attendees"])
+
+        assert results == {
+            "e1": {"entrylist": {"event": "e1"}, "attendees": {"error": "denied"}},
+            "e2": {"entrylist": {"event": "e2"}, "attendees": {"error": "denied"}},
+        }
+
+    def test_get_events_bulk_rejects_unknown_endpoint(self, client):
+        """Test that unknown endpoint keys are rejected up front."""
+        with pytest.raises(ValueError) as exc_info:
+            client.get_events_bulk(["e1"], endpoints=["bogus"])
+
+        assert "bogus" in str(exc_info.value)
+
+    def test_get_events_bulk_with_no_events(self, client):
+        """Test that an empty event list returns an empty result."""
+        assert client.get_events_bulk([]) == {}
+
+    @patch("hpde_analytics_cli.api.client.time.sleep")
+    def test_rate_limit_holds_back_new_requests(self, mock_sleep, client, mock_oauth):
+        """Test that a 429 seen by one request delays the next request."""
+        mock_session = MagicMock()
+        rate_limited = MagicMock()
+        rate_limited.status_code = 429
+        rate_limited.headers = {"Retry-After": "5"}
+        rate_limited.text = "Too Many Requests"
+        mock_session.get.return_value = rate_limited
+        mock_oauth.get_oauth_session.return_value = mock_session
+
+        with patch("hpde_analytics_cli.api.client.time.monotonic", return_value=100.0):
+            with pytest.raises(APIError):
+                client._request("GET", "/rest/first.json", retries=1)
+            mock_sleep.reset_mock()
+            with pytest.raises(APIError):
+                client._request("GET", "/rest/second.json", retries=0)
+
+        mock_sleep.assert_called_once_with(5.0)
+
+    def test_fetch_progress_is_logged(self, client, caplog):
+        """Test that fetch progress goes to the API logger instead of stdout."""
+        with (
+            patch.object(client, "get_me", return_value={}),
+            caplog.at_level("INFO", logger="hpde_analytics_cli.api"),
+        ):
+            results: dict = {}
+            client._fetch_user_profile(results)
+
+        assert "[OK] User profile retrieved" in caplog.text
+
+    def test_get_all_endpoint_data_skips_event_endpoints_without_event(self, client):
+        """Test that event endpoints are skipped when no event ID is available."""
+        with (
+            patch.object(client, "get_me", return_value={}),
+            patch.object(client, "get_organization_calendar", return_value={"events": []}),
+        ):
+            results = client.get_all_endpoint_data()
+
+        assert list(results.keys()) == ["me", "calendar"]
+
+
+class TestParseJson:
+    """Tests for MSRClient._parse_json."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a client instance for testing."""
+        oauth = MagicMock()
+        oauth.base_url = "https://api.motorsportreg.com"
+        return MSRClient(oauth=oauth)
+
+    def test_parses_raw_bytes(self, client):
+        """Test that the body is parsed from response.content."""
+        mock_response = MagicMock()
+        mock_response.content = b'{"response": {"id": 1}}'
+
+        assert client._parse_json(mock_response) == {"response": {"id": 1}}
+        mock_response.json.assert_not_called()
+
+    def test_uses_module_loader(self, client):
+        """Test that parsing goes through the orjson/stdlib loader."""
+        mock_response = MagicMock()
+        mock_response.content = b"{}"
+        mock_loads = MagicMock(return_value={"parsed": True})
+
+        with patch("hpde_analytics_cli.api.client._loads", mock_loads):
+            result = client._parse_json(mock_response)
+
+        assert result == {"parsed": True}
+        mock_loads.assert_called_once_with(b"{}")
+
+    def test_invalid_body_raises(self, client):
+        """Test that a malformed body raises a ValueError for the retry loop."""
+        mock_response = MagicMock()
+        mock_response.content = b"<html>"
+
+        with pytest.raises(ValueError):
+            client._parse_json(mock_response)
+
 
 class TestCreateClientFromOAuth:
     """Tests for create_client_from_oauth function."""
@@ -313,6 +748,17 @@ class TestCreateClientFromOAuth:
 
         assert client.organization_id == "org-1"
 
+    def test_default_org_id_is_memoized(self):
+        """Test that the default organization is resolved only once."""
+        mock_oauth = MagicMock()
+        mock_oauth.base_url = "https://api.motorsportreg.com"
+        mock_oauth.organizations = [{"id": "org-1"}]
+
+        client = create_client_from_oauth(mock_oauth)
+        mock_oauth.organizations = [{"id": "org-2"}]
+
+        assert client.default_org_id == "org-1"
+
     def test_handles_empty_organizations(self):
         """Test handling when no organizations available."""
         mock_oauth = MagicMock()
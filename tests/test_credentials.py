@@ -2,23 +2,37 @@
 Tests for the credentials module.
 """
 
+import json
 import os
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from hpde_analytics_cli.auth import credentials
 from hpde_analytics_cli.auth.credentials import (
     APP_NAME,
+    KEY_COMBINED,
     KEY_CONSUMER_KEY,
     KEY_CONSUMER_SECRET,
     CredentialManager,
     get_credential_manager,
+    refresh_env,
 )
 
 
 class TestCredentialManager:
     """Tests for CredentialManager class."""
 
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self, tmp_path):
+        """Start every test with empty credential and keyring probe caches."""
+        CredentialManager.invalidate_cache()
+        with patch(
+            "hpde_analytics_cli.auth.credentials.PROBE_CACHE_FILE", tmp_path / "keyring_probe.json"
+        ):
+            yield
+        CredentialManager.invalidate_cache()
+
     def test_init_default_app_name(self):
         """Test initialization with default app name."""
         manager = CredentialManager()
@@ -36,6 +50,7 @@ class TestCredentialManager:
         with patch.dict(
             os.environ, {"MSR_CONSUMER_KEY": "test_key", "MSR_CONSUMER_SECRET": "test_secret"}
         ):
+            refresh_env()
             key, secret = manager.get_credentials_from_env()
             assert key == "test_key"
             assert secret == "test_secret"
@@ -48,6 +63,7 @@ class TestCredentialManager:
             # Remove the keys if they exist
             os.environ.pop("MSR_CONSUMER_KEY", None)
             os.environ.pop("MSR_CONSUMER_SECRET", None)
+            refresh_env()
 
             key, secret = manager.get_credentials_from_env()
             assert key is None
@@ -59,6 +75,7 @@ class TestCredentialManager:
 
         with patch.dict(os.environ, {"MSR_CONSUMER_KEY": "test_key"}, clear=True):
             os.environ.pop("MSR_CONSUMER_SECRET", None)
+            refresh_env()
             key, secret = manager.get_credentials_from_env()
             assert key == "test_key"
             assert secret is None
@@ -85,6 +102,76 @@ class TestCredentialManager:
         manager = CredentialManager()
         assert manager.keyring_available() is False
 
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
+    @patch("hpde_analytics_cli.auth.credentials.keyring")
+    def test_keyring_available_probes_once(self, mock_keyring):
+        """Test keyring_available memoizes the backend probe."""
+        mock_keyring.get_password.return_value = None
+        manager = CredentialManager()
+
+        assert manager.keyring_available() is True
+        assert manager.keyring_available() is True
+        assert mock_keyring.get_password.call_count == 1
+
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
+    @patch("hpde_analytics_cli.auth.credentials.keyring")
+    def test_invalidate_keyring_probe(self, mock_keyring):
+        """Test invalidate_keyring_probe forces a fresh probe."""
+        mock_keyring.get_password.return_value = None
+        manager = CredentialManager()
+        assert manager.keyring_available() is True
+
+        mock_keyring.get_password.side_effect = Exception("Backend gone")
+        assert manager.keyring_available() is True
+
+        manager.invalidate_keyring_probe()
+        assert manager.keyring_available() is False
+
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
+    @patch("hpde_analytics_cli.auth.credentials.keyring")
+    def test_keyring_probe_persisted_across_managers(self, mock_keyring):
+        """Test a recent probe result on disk is reused by a new manager."""
+        mock_keyring.get_password.return_value = None
+        assert CredentialManager().keyring_available() is True
+        assert credentials.PROBE_CACHE_FILE.exists()
+
+        mock_keyring.get_password.side_effect = Exception("Backend gone")
+        assert CredentialManager().keyring_available() is True
+        assert mock_keyring.get_password.call_count == 1
+
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
+    @patch("hpde_analytics_cli.auth.credentials.keyring")
+    def test_failed_keyring_probe_not_persisted(self, mock_keyring):
+        """Test a failed probe is re-run by the next manager instead of being cached."""
+        mock_keyring.get_password.side_effect = Exception("Locked")
+        assert CredentialManager().keyring_available() is False
+        assert not credentials.PROBE_CACHE_FILE.exists()
+
+        mock_keyring.get_password.side_effect = None
+        mock_keyring.get_password.return_value = None
+        assert CredentialManager().keyring_available() is True
+        assert mock_keyring.get_password.call_count == 2
+
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
+    @patch("hpde_analytics_cli.auth.credentials.keyring")
+    def test_keyring_probe_stale_file_reprobes(self, mock_keyring):
+        """Test an expired probe result on disk is ignored."""
+        credentials.PROBE_CACHE_FILE.write_text(json.dumps({"available": True, "ts": 0}))
+        mock_keyring.get_password.side_effect = Exception("Backend gone")
+
+        assert CredentialManager().keyring_available() is False
+        assert mock_keyring.get_password.call_count == 1
+
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
+    @patch("hpde_analytics_cli.auth.credentials.keyring")
+    def test_store_failure_clears_probe_file(self, mock_keyring):
+        """Test a failed keyring write drops the persisted probe result."""
+        mock_keyring.get_password.return_value = None
+        mock_keyring.set_password.side_effect = Exception("Locked")
+
+        assert CredentialManager().store_credentials("key", "secret") is False
+        assert not credentials.PROBE_CACHE_FILE.exists()
+
     @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
     @patch("hpde_analytics_cli.auth.credentials.keyring")
     def test_get_credentials_from_keyring_success(self, mock_keyring):
@@ -99,6 +186,21 @@ class TestCredentialManager:
         assert key == "keyring_key"
         assert secret == "keyring_secret"
 
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
+    @patch("hpde_analytics_cli.auth.credentials.keyring")
+    def test_get_credentials_from_keyring_combined_entry(self, mock_keyring):
+        """Test the combined entry is read with a single keyring lookup."""
+        payload = json.dumps({"key": "keyring_key", "secret": "keyring_secret"})
+        mock_keyring.get_password.side_effect = lambda app, key: {KEY_COMBINED: payload}.get(key)
+
+        manager = CredentialManager()
+        assert manager.keyring_available() is True
+        mock_keyring.get_password.reset_mock()
+
+        key, secret = manager.get_credentials_from_keyring()
+        assert (key, secret) == ("keyring_key", "keyring_secret")
+        mock_keyring.get_password.assert_called_once_with(APP_NAME, KEY_COMBINED)
+
     @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", False)
     def test_get_credentials_from_keyring_not_available(self):
         """Test keyring credentials when keyring not available."""
@@ -121,6 +223,7 @@ class TestCredentialManager:
         with patch.dict(
             os.environ, {"MSR_CONSUMER_KEY": "env_key", "MSR_CONSUMER_SECRET": "env_secret"}
         ):
+            refresh_env()
             key, secret = manager.get_credentials()
             assert key == "keyring_key"
             assert secret == "keyring_secret"
@@ -133,6 +236,7 @@ class TestCredentialManager:
         with patch.dict(
             os.environ, {"MSR_CONSUMER_KEY": "env_key", "MSR_CONSUMER_SECRET": "env_secret"}
         ):
+            refresh_env()
             key, secret = manager.get_credentials()
             assert key == "env_key"
             assert secret == "env_secret"
@@ -145,12 +249,57 @@ class TestCredentialManager:
         with patch.dict(os.environ, {}, clear=True):
             os.environ.pop("MSR_CONSUMER_KEY", None)
             os.environ.pop("MSR_CONSUMER_SECRET", None)
+            refresh_env()
 
             with pytest.raises(ValueError) as exc_info:
                 manager.get_credentials()
 
             assert "No credentials found" in str(exc_info.value)
 
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
+    @patch("hpde_analytics_cli.auth.credentials.keyring")
+    def test_get_credentials_cached_across_managers(self, mock_keyring):
+        """Test resolved credentials are reused by other manager instances."""
+        payload = json.dumps({"key": "keyring_key", "secret": "keyring_secret"})
+        mock_keyring.get_password.side_effect = lambda app, key: {KEY_COMBINED: payload}.get(key)
+
+        assert CredentialManager().get_credentials() == ("keyring_key", "keyring_secret")
+        calls = mock_keyring.get_password.call_count
+
+        assert CredentialManager().get_credentials() == ("keyring_key", "keyring_secret")
+        assert mock_keyring.get_password.call_count == calls
+
+        CredentialManager.invalidate_cache()
+        CredentialManager().get_credentials()
+        assert mock_keyring.get_password.call_count > calls
+
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", False)
+    def test_get_credentials_from_env_uses_snapshot(self):
+        """Test environment changes are only seen after refresh_env."""
+        with patch.dict(
+            os.environ, {"MSR_CONSUMER_KEY": "env_key", "MSR_CONSUMER_SECRET": "env_secret"}
+        ):
+            refresh_env()
+            os.environ["MSR_CONSUMER_KEY"] = "other_key"
+            assert CredentialManager().get_credentials_from_env() == ("env_key", "env_secret")
+
+            refresh_env()
+            assert CredentialManager().get_credentials_from_env() == ("other_key", "env_secret")
+
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
+    @patch("hpde_analytics_cli.auth.credentials.keyring")
+    def test_store_credentials_invalidates_cache(self, mock_keyring):
+        """Test storing new credentials drops the cached pair."""
+        stored = {KEY_COMBINED: json.dumps({"key": "old_key", "secret": "old_secret"})}
+        mock_keyring.get_password.side_effect = lambda app, key: stored.get(key)
+        mock_keyring.set_password.side_effect = lambda app, key, value: stored.update({key: value})
+
+        manager = CredentialManager()
+        assert manager.get_credentials() == ("old_key", "old_secret")
+
+        manager.store_credentials("new_key", "new_secret")
+        assert manager.get_credentials() == ("new_key", "new_secret")
+
     @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
     @patch("hpde_analytics_cli.auth.credentials.keyring")
     def test_store_credentials_success(self, mock_keyring):
@@ -161,7 +310,10 @@ class TestCredentialManager:
         result = manager.store_credentials("new_key", "new_secret")
 
         assert result is True
-        assert mock_keyring.set_password.call_count == 2
+        mock_keyring.set_password.assert_called_once()
+        app, key, payload = mock_keyring.set_password.call_args[0]
+        assert key == KEY_COMBINED
+        assert json.loads(payload) == {"key": "new_key", "secret": "new_secret"}
 
     @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", False)
     def test_store_credentials_keyring_not_available(self, capsys):
@@ -183,7 +335,18 @@ class TestCredentialManager:
         result = manager.delete_credentials()
 
         assert result is True
-        assert mock_keyring.delete_password.call_count == 2
+        deleted_keys = [c[0][1] for c in mock_keyring.delete_password.call_args_list]
+        assert deleted_keys == [KEY_COMBINED, KEY_CONSUMER_KEY, KEY_CONSUMER_SECRET]
+
+    @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", True)
+    @patch("hpde_analytics_cli.auth.credentials.keyring")
+    def test_delete_credentials_nothing_stored(self, mock_keyring):
+        """Test deleting credentials returns False when no entry exists."""
+        mock_keyring.get_password.return_value = None
+        mock_keyring.delete_password.side_effect = Exception("Not found")
+
+        manager = CredentialManager()
+        assert manager.delete_credentials() is False
 
     @patch("hpde_analytics_cli.auth.credentials.KEYRING_AVAILABLE", False)
     def test_delete_credentials_keyring_not_available(self):
@@ -222,3 +385,11 @@ class TestGetCredentialManager:
         manager = get_credential_manager()
         assert isinstance(manager, CredentialManager)
         assert manager.app_name == APP_NAME
+
+    def test_returns_shared_instance(self):
+        """Test that repeat calls return the same manager."""
+        get_credential_manager.cache_clear()
+        try:
+            assert get_credential_manager() is get_credential_manager()
+        finally:
+            get_credential_manager.cache_clear()
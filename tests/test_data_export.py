@@ -3,14 +3,18 @@ Tests for the data export module.
 """
 
 import csv
+import filecmp
 import json
 import os
 import tempfile
+import threading
+from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from hpde_analytics_cli.utils.data_export import DataExporter
+from hpde_analytics_cli.utils import _dumps
+from hpde_analytics_cli.utils.data_export import STREAM_JSON_MIN_ITEMS, DataExporter
 
 
 class TestDataExporter:
@@ -44,6 +48,23 @@ class TestDataExporter:
         exporter = DataExporter(output_dir=temp_dir, name="custom_export")
         assert exporter.custom_name == "custom_export"
 
+    def test_init_shares_run_timestamp(self, temp_dir):
+        """Test exporters in one run share a timestamp unless one is given."""
+        assert DataExporter(temp_dir).export_timestamp == DataExporter().export_timestamp
+        assert DataExporter(temp_dir, timestamp="20240101_000000").export_timestamp == (
+            "20240101_000000"
+        )
+
+    def test_output_path_follows_output_dir(self, temp_dir):
+        """Test file paths match os.path.join after output_dir changes."""
+        exporter = DataExporter(output_dir=temp_dir)
+        assert exporter._output_path("a", "json", False) == os.path.join(temp_dir, "a.json")
+
+        exporter.output_dir = os.path.join(temp_dir, "raw_data")
+        assert exporter._output_path("a", "csv", True) == os.path.join(
+            temp_dir, "raw_data", f"a_{exporter.export_timestamp}.csv"
+        )
+
     def test_ensure_dir_creates_directory(self, temp_dir):
         """Test that _ensure_dir creates directories."""
         exporter = DataExporter(output_dir=temp_dir)
@@ -54,6 +75,14 @@ class TestDataExporter:
         assert os.path.exists(new_dir)
         assert os.path.isdir(new_dir)
 
+    @patch("hpde_analytics_cli.utils.data_export.os.makedirs")
+    def test_ensure_dir_creates_once(self, mock_makedirs, exporter, temp_dir):
+        """Test repeated exports to one directory only create it once."""
+        exporter.export_json({"a": 1}, "one", include_timestamp=False)
+        exporter.export_json({"a": 2}, "two", include_timestamp=False)
+
+        mock_makedirs.assert_called_once_with(temp_dir, exist_ok=True)
+
     def test_ensure_dir_existing_directory(self, temp_dir):
         """Test that _ensure_dir handles existing directories."""
         exporter = DataExporter(output_dir=temp_dir)
@@ -84,17 +113,54 @@ class TestDataExporter:
 
         assert result == {"a.b.c": "deep_value"}
 
+    def test_flatten_dict_preserves_key_order(self, exporter):
+        """Test nested keys appear where their parent was, in original order."""
+        data = {"a": 1, "b": {"c": 2, "d": {"e": 3}, "f": 4}, "g": 5}
+        result = exporter._flatten_dict(data)
+
+        assert list(result) == ["a", "b.c", "b.d.e", "b.f", "g"]
+
+    def test_flatten_dict_empty_nested_dict(self, exporter):
+        """Test an empty nested dictionary contributes no keys."""
+        data = {"a": {}, "b": 1}
+        result = exporter._flatten_dict(data)
+
+        assert result == {"b": 1}
+
+    def test_flatten_dict_reuses_key_strings(self, exporter):
+        """Test records with the same shape share the joined key objects."""
+        first = exporter._flatten_dict({"a": {"b": 1}})
+        second = exporter._flatten_dict({"a": {"b": 2}})
+
+        assert next(iter(first)) is next(iter(second))
+        assert exporter._flatten_dict({"a": {"b": 3}}, sep="_") == {"a_b": 3}
+
     def test_flatten_dict_with_list(self, exporter):
         """Test flattening dictionary with list values."""
         data = {"items": [1, 2, 3]}
+        result = exporter._flatten_dict(data, stringify_lists=True)
+
+        assert result["items"] == "[1,2,3]"
+
+    def test_flatten_dict_keeps_native_lists(self, exporter):
+        """Test lists are left as lists unless encoding is requested."""
+        data = {"a": {"items": [1, 2, 3]}, "empty": []}
         result = exporter._flatten_dict(data)
 
-        assert result["items"] == "[1, 2, 3]"
+        assert result == {"a.items": [1, 2, 3], "empty": []}
+
+    def test_flatten_dict_list_of_dicts_is_compact_json(self, exporter):
+        """Test list fields are stored as compact JSON that round-trips."""
+        data = {"items": [{"name": "Zoë", "n": 1}]}
+        result = exporter._flatten_dict(data, stringify_lists=True)
+
+        assert result["items"] == '[{"name":"Zoë","n":1}]'
+        assert json.loads(result["items"]) == data["items"]
 
     def test_flatten_dict_empty_list(self, exporter):
         """Test flattening dictionary with empty list."""
         data = {"items": []}
-        result = exporter._flatten_dict(data)
+        result = exporter._flatten_dict(data, stringify_lists=True)
 
         assert result["items"] == ""
 
@@ -122,6 +188,95 @@ class TestDataExporter:
         assert filepath.endswith("test_file.json")
         assert exporter.export_timestamp not in filepath
 
+    def test_export_json_overwrites_longer_file(self, exporter, temp_dir):
+        """Test re-exporting truncates an existing longer file."""
+        exporter.export_json({"test": "x" * 100}, "test_file", include_timestamp=False)
+        filepath = exporter.export_json({"test": "y"}, "test_file", include_timestamp=False)
+
+        with open(filepath, "r") as f:
+            assert json.load(f) == {"test": "y"}
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_export_json_handles_big_integers(self, exporter, temp_dir, compact):
+        """Test integers beyond 64 bits are written exactly instead of failing."""
+        data = {"big": 10**20, "small": 1}
+
+        filepath = exporter.export_json(data, "test_file", include_timestamp=False, compact=compact)
+
+        with open(filepath, "rb") as f:
+            payload = f.read()
+        assert payload == _dumps({"big": "x", "small": 1}, indent=not compact).replace(
+            b'"x"', b"100000000000000000000"
+        )
+        assert json.loads(payload) == data
+
+    @patch("hpde_analytics_cli.utils.data_export.os.write")
+    def test_export_json_handles_short_writes(self, mock_write, exporter, temp_dir):
+        """Test partial os.write calls are continued until all bytes are written."""
+        written = bytearray()
+
+        def short_write(fd, buf):
+            chunk = bytes(buf[:3])
+            written.extend(chunk)
+            return len(chunk)
+
+        mock_write.side_effect = short_write
+        exporter.export_json({"test": "data"}, "test_file", include_timestamp=False)
+
+        assert json.loads(bytes(written)) == {"test": "data"}
+
+    @patch("hpde_analytics_cli.utils.data_export._STREAM_BLOCK_SIZE", 256)
+    def test_export_json_streams_large_lists(self, exporter, temp_dir):
+        """Test large lists are streamed with output identical to a single dump."""
+        data = {
+            "events": [
+                {"id": i, "name": f"Event \u00e9 {i}\nline", "tags": [], "venue": {"id": i}}
+                for i in range(STREAM_JSON_MIN_ITEMS + 1)
+            ],
+            "empty": [],
+            "meta": {"count": 1, "nested": {"a": [1, 2]}},
+            "total": 3,
+        }
+
+        with patch("hpde_analytics_cli.utils.data_export._write_bytes") as mock_write_bytes:
+            filepath = exporter.export_json(data, "calendar", include_timestamp=False)
+
+        mock_write_bytes.assert_not_called()
+        with open(filepath, "rb") as f:
+            assert f.read() == _dumps(data, indent=True)
+
+    @patch("hpde_analytics_cli.utils.data_export._write_chunks")
+    def test_export_json_small_lists_not_streamed(self, mock_write_chunks, exporter, temp_dir):
+        """Test ordinary documents are written in one piece."""
+        exporter.export_json({"events": [{"id": 1}]}, "calendar", include_timestamp=False)
+
+        mock_write_chunks.assert_not_called()
+
+    def test_export_json_compact(self, exporter, temp_dir):
+        """Test compact JSON has no indentation and loads back unchanged."""
+        data = {"events": [{"id": 1, "name": "Test"}]}
+
+        filepath = exporter.export_json(data, "compact", include_timestamp=False, compact=True)
+
+        with open(filepath, "rb") as f:
+            content = f.read()
+        assert b"\n" not in content
+        assert json.loads(content) == data
+
+    def test_export_all_data_compact_json(self, temp_dir):
+        """Test compact_json applies to the endpoint dumps but not the summary."""
+        client = MagicMock()
+        client.organization_id = "org"
+        client.get_me.return_value = {"firstName": "Test"}
+        exporter = DataExporter(output_dir=temp_dir, compact_json=True)
+
+        exported_files = exporter.export_all_data(client, "event-123")
+
+        with open(exported_files["raw_profile"], "rb") as f:
+            assert f.read() == b'{"firstName":"Test"}'
+        with open(exported_files["summary"], "rb") as f:
+            assert b"\n" in f.read()
+
     def test_export_json_complex_data(self, exporter, temp_dir):
         """Test JSON export with complex data."""
         data = {
@@ -140,6 +295,16 @@ class TestDataExporter:
             loaded = json.load(f)
         assert loaded == data
 
+    def test_export_json_unserializable_values(self, exporter, temp_dir):
+        """Test JSON export falls back to str() and stringifies non-string keys."""
+        data = {"amount": Decimal("12.50"), 7: "seven"}
+
+        filepath = exporter.export_json(data, "fallback", include_timestamp=False)
+
+        with open(filepath, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        assert loaded == {"amount": "12.50", "7": "seven"}
+
     def test_export_csv_basic(self, exporter, temp_dir):
         """Test basic CSV export."""
         data = [{"name": "John", "age": "30"}, {"name": "Jane", "age": "25"}]
@@ -157,6 +322,59 @@ class TestDataExporter:
         assert rows[0]["name"] == "John"
         assert rows[1]["name"] == "Jane"
 
+    def test_export_csv_encodes_lists_once(self, exporter, temp_dir):
+        """Test list cells are JSON-encoded only in the writing pass."""
+        data = [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": ["b", "c"]}]
+
+        with patch(
+            "hpde_analytics_cli.utils.data_export._dumps_compact", side_effect=json.dumps
+        ) as mock_dumps:
+            filepath = exporter.export_csv(data, "tags", include_timestamp=False)
+
+        assert mock_dumps.call_count == 2
+        with open(filepath, "r", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert json.loads(rows[1]["tags"]) == ["b", "c"]
+
+    def test_export_csv_mixed_layouts(self, exporter, temp_dir):
+        """Test records with reordered or missing keys land in the right columns."""
+        data = [
+            {"a": 1, "b": {"c": 2}},
+            {"b": {"c": 4}, "a": 3},
+            {"a": 5},
+            {"a": None, "b": {"c": 6}},
+        ]
+
+        filepath = exporter.export_csv(data, "layouts", include_timestamp=False)
+
+        with open(filepath, "r", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows == [["a", "b.c"], ["1", "2"], ["3", "4"], ["5", ""], ["", "6"]]
+
+    def test_export_feather(self, temp_dir):
+        """Test Feather export keeps native types and stringifies mixed columns."""
+        pyarrow_feather = pytest.importorskip("pyarrow.feather")
+        exporter = DataExporter(output_dir=temp_dir, feather=True)
+        data = [
+            {"id": 1, "info": {"ok": True}, "tags": ["a"], "mixed": 1},
+            {"id": 2, "extra": "x", "mixed": "two"},
+        ]
+
+        filepath = exporter.export_feather(data, "records", include_timestamp=False)
+
+        table = pyarrow_feather.read_table(filepath)
+        assert table.column_names == ["id", "info.ok", "tags", "mixed", "extra"]
+        assert table.column("id").to_pylist() == [1, 2]
+        assert table.column("tags").to_pylist() == ['["a"]', None]
+        assert table.column("mixed").to_pylist() == ["1", "two"]
+        assert table.column("extra").to_pylist() == [None, "x"]
+
+    @patch("hpde_analytics_cli.utils.data_export.PYARROW_AVAILABLE", False)
+    def test_feather_requires_pyarrow(self, temp_dir):
+        """Test requesting Feather output without pyarrow fails early."""
+        with pytest.raises(ImportError, match="pyarrow"):
+            DataExporter(output_dir=temp_dir, feather=True)
+
     def test_export_csv_with_timestamp(self, exporter, temp_dir):
         """Test CSV export with timestamp."""
         data = [{"col": "value"}]
@@ -189,6 +407,31 @@ class TestDataExporter:
         assert "details.color" in rows[0]
         assert rows[0]["details.color"] == "red"
 
+    def test_export_csv_missing_and_none_values_blank(self, exporter, temp_dir):
+        """Test missing fields and None values are written as empty cells."""
+        data = [{"name": "John", "age": None}, {"name": "Jane", "city": "NYC"}]
+
+        filepath = exporter.export_csv(data, "blanks", include_timestamp=False)
+
+        with open(filepath, "r", newline="") as f:
+            rows = list(csv.reader(f))
+
+        assert rows == [["name", "age", "city"], ["John", "", ""], ["Jane", "", "NYC"]]
+
+    def test_export_csv_columns_in_first_seen_order(self, exporter, temp_dir):
+        """Test CSV columns follow record key order, with new keys appended."""
+        data = [
+            {"name": "John", "vehicle": {"make": "Mazda"}, "age": "30"},
+            {"name": "Jane", "age": "25", "city": "NYC"},
+        ]
+
+        filepath = exporter.export_csv(data, "ordered", include_timestamp=False)
+
+        with open(filepath, "r", newline="") as f:
+            fieldnames = csv.DictReader(f).fieldnames
+
+        assert fieldnames == ["name", "vehicle.make", "age", "city"]
+
     def test_export_csv_varying_fields(self, exporter, temp_dir):
         """Test CSV export with records having different fields."""
         data = [{"name": "John", "age": "30"}, {"name": "Jane", "city": "NYC"}]
@@ -253,6 +496,35 @@ class TestDataExporterExportAllData:
         raw_data_dir = os.path.join(export_dir, "raw_data")
         assert os.path.exists(raw_data_dir)
 
+    def test_export_all_data_makes_directories_once(self, temp_dir, mock_client):
+        """Test one nested makedirs call creates both export folders."""
+        exporter = DataExporter(output_dir=temp_dir)
+
+        with patch(
+            "hpde_analytics_cli.utils.data_export.os.makedirs", wraps=os.makedirs
+        ) as mock_makedirs:
+            exporter.export_all_data(mock_client, "event-123")
+
+        # The second call is os.makedirs recursing to create the parent itself
+        export_dir = os.path.join(temp_dir, f"export_{exporter.export_timestamp}")
+        assert [c.args[0] for c in mock_makedirs.call_args_list] == [
+            os.path.join(export_dir, "raw_data"),
+            export_dir,
+        ]
+
+    def test_export_all_data_writes_raw_feather(self, temp_dir, mock_client):
+        """Test Feather files are written next to raw CSVs when requested."""
+        pytest.importorskip("pyarrow")
+        exporter = DataExporter(output_dir=temp_dir, feather=True)
+
+        exported_files = exporter.export_all_data(mock_client, "event-123")
+
+        assert exported_files["raw_attendees_feather"].endswith(
+            os.path.join("raw_data", "attendees_full.feather")
+        )
+        assert os.path.exists(exported_files["raw_attendees_feather"])
+        assert not any(key.endswith("_feather") and "raw" not in key for key in exported_files)
+
     def test_export_all_data_with_custom_name(self, temp_dir, mock_client):
         """Test export with custom name."""
         exporter = DataExporter(output_dir=temp_dir, name="HPDE_TT_1")
@@ -312,6 +584,76 @@ class TestDataExporterExportAllData:
         captured = capsys.readouterr()
         assert "[ERROR]" in captured.out
 
+    def test_export_all_data_fetches_concurrently(self, temp_dir, mock_client):
+        """Test that all endpoints are requested at the same time."""
+        barrier = threading.Barrier(5, timeout=5)
+
+        def waiting(value):
+            def fetch(*args):
+                barrier.wait()
+                return value
+
+            return fetch
+
+        for name in (
+            "get_me",
+            "get_organization_calendar",
+            "get_event_entrylist",
+            "get_event_attendees",
+            "get_event_assignments",
+        ):
+            method = getattr(mock_client, name)
+            method.side_effect = waiting(method.return_value)
+
+        exporter = DataExporter(output_dir=temp_dir)
+        exported_files = exporter.export_all_data(mock_client, "event-123")
+
+        assert "raw_profile" in exported_files
+        assert "raw_assignments" in exported_files
+        mock_client.get_event_attendees.assert_called_once_with("event-123")
+
+    def test_export_all_data_verbose_output_order(self, temp_dir, mock_client, capsys):
+        """Test progress lines stay grouped per endpoint and in a fixed order."""
+        release = threading.Event()
+
+        def slow_profile():
+            release.wait(5)
+            return {"firstName": "Test"}
+
+        def calendar():
+            release.set()
+            return {"events": [{"id": "event-1"}]}
+
+        mock_client.get_me.side_effect = slow_profile
+        mock_client.get_organization_calendar.side_effect = calendar
+
+        exporter = DataExporter(output_dir=temp_dir)
+        exported_files = exporter.export_all_data(mock_client, "event-123", verbose=True)
+
+        lines = capsys.readouterr().out.splitlines()
+        profile_at = lines.index("  Exporting raw_profile...")
+        calendar_at = lines.index("  Exporting raw_calendar...")
+        assert calendar_at == profile_at + 2
+        assert "[OK]" in lines[profile_at + 1]
+        assert list(exported_files)[:3] == ["raw_profile", "raw_calendar", "raw_calendar_csv"]
+
+    def test_export_all_data_filtered_files_reuse_raw_exports(self, temp_dir, mock_client):
+        """Test filtered files are copies of the raw exports, not re-serialized."""
+        exporter = DataExporter(output_dir=temp_dir)
+
+        with patch.object(exporter, "export_csv", wraps=exporter.export_csv) as mock_csv:
+            exported_files = exporter.export_all_data(mock_client, "event-123")
+
+        # Only the four raw list endpoints are flattened and written as CSV
+        assert mock_csv.call_count == 4
+        assert filecmp.cmp(
+            exported_files["raw_attendees"], exported_files["attendees"], shallow=False
+        )
+        assert filecmp.cmp(
+            exported_files["raw_attendees_csv"], exported_files["attendees_csv"], shallow=False
+        )
+        assert exported_files["calendar"].endswith("calendar_events.json")
+
     def test_export_all_data_summary_content(self, temp_dir, mock_client):
         """Test that summary file contains expected information."""
         exporter = DataExporter(output_dir=temp_dir)
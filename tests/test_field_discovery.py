@@ -0,0 +1,169 @@
+"""
+Tests for the field discovery module.
+"""
+
+from collections import OrderedDict
+from enum import IntEnum
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hpde_analytics_cli.utils.field_discovery import FieldDiscovery, FieldInfo
+
+
+@pytest.fixture
+def discovery():
+    """Create an empty FieldDiscovery instance."""
+    return FieldDiscovery()
+
+
+class TestDetectType:
+    """Tests for FieldDiscovery._detect_type."""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (None, "null"),
+            (True, "boolean"),
+            (3, "integer"),
+            (2.5, "number"),
+            ([1], "array"),
+            ({"a": 1}, "object"),
+            ("Porsche", "string"),
+            ("", "string"),
+            ("2025-06-01", "date"),
+            ("2025-06-01T08:00:00", "datetime"),
+            ("06/01/2025", "date"),
+            ("123e4567-e89b-12d3-a456-426614174000", "uuid"),
+            ("https://api.motorsportreg.com", "url"),
+            ("driver@example.com", "email"),
+            ("2025-06-01x", "string"),
+            ("http", "string"),
+            ("a@b", "string"),
+            (object(), "unknown"),
+            (IntEnum("Level", "NOVICE").NOVICE, "integer"),
+            (OrderedDict(a=1), "object"),
+        ],
+    )
+    def test_detects_types(self, discovery, value, expected):
+        """Test each supported value maps to its type name."""
+        assert discovery._detect_type(value) == expected
+
+    def test_plain_strings_skip_regexes(self, discovery):
+        """Test ordinary labels never reach the pattern matchers."""
+        date = MagicMock()
+        with (
+            patch.object(FieldDiscovery, "DATE_PATTERNS", [date]),
+            patch.object(FieldDiscovery, "UUID_PATTERN") as uuid,
+            patch.object(FieldDiscovery, "URL_PATTERN") as url,
+            patch.object(FieldDiscovery, "EMAIL_PATTERN") as email,
+        ):
+            assert discovery._detect_type("Time Trials - Saturday") == "string"
+
+        date.match.assert_not_called()
+        uuid.match.assert_not_called()
+        url.match.assert_not_called()
+        email.match.assert_not_called()
+
+
+class TestAnalyzeResponse:
+    """Tests for FieldDiscovery.analyze_response."""
+
+    def test_records_nested_and_array_fields(self, discovery):
+        """Test nested objects and array items are recorded by path."""
+        data = {
+            "event": {"name": "Test", "venue": {"city": "Austin"}},
+            "attendees": [{"email": "a@example.com"}, {"email": None}],
+        }
+
+        count = discovery.analyze_response(data, "calendar")
+
+        assert count == 4
+        assert discovery.fields["event.venue.city"].field_type == "string"
+        assert discovery.fields["attendees"].field_type == "array"
+        email = discovery.fields["attendees[].email"]
+        assert email.field_type == "email"
+        assert email.occurrences == 2
+        assert email.nullable is True
+
+    def test_known_fields_skip_type_detection(self, discovery):
+        """Test repeated records only detect each leaf's type until it is known."""
+        data = {"rows": [{"name": None, "email": "a@example.com"}] + [{"name": "x"}] * 2}
+
+        with patch.object(discovery, "_detect_type", wraps=discovery._detect_type) as detect:
+            discovery.analyze_response(data, "rows")
+
+        assert [c.args[0] for c in detect.call_args_list] == [None, "a@example.com", "x"]
+        name = discovery.fields["rows[].name"]
+        assert (name.field_type, name.nullable, name.occurrences) == ("string", True, 3)
+        assert name.sample_value == "x"
+
+    def test_endpoint_fields_hold_each_path_once(self, discovery):
+        """Test repeated paths are tracked once per endpoint."""
+        discovery.analyze_response({"rows": [{"id": 1}, {"id": 2}]}, "rows")
+        discovery.analyze_response({"rows": [{"id": 3}]}, "rows")
+
+        assert discovery.endpoint_fields == {"rows": {"rows", "rows[].id"}}
+
+    def test_skips_error_responses(self, discovery):
+        """Test error responses are not analyzed."""
+        assert discovery.analyze_response({"error": "boom"}, "me") == 0
+        assert discovery.fields == {}
+
+    def test_inventory_groups_fields_by_endpoint(self, discovery):
+        """Test the inventory lists each endpoint's fields in sorted order."""
+        discovery.analyze_all_responses({"me": {"b": 1, "a": "x"}, "events": {"a": "y"}})
+
+        inventory = discovery.get_inventory()
+
+        assert inventory["summary"]["field_counts"] == {"me": 2, "events": 1}
+        assert [f["path"] for f in inventory["endpoints"]["me"]["fields"]] == ["a", "b"]
+        assert [f["path"] for f in inventory["all_fields"]] == ["a", "b"]
+
+
+class TestSortedPaths:
+    """Tests for FieldDiscovery._sorted_paths."""
+
+    def test_sorts_once_until_fields_change(self, discovery):
+        """Test summary and inventory share one sort per endpoint."""
+        discovery.analyze_response({"b": 1, "a": 2}, "me")
+
+        first = discovery._sorted_paths("me")
+        assert first == ["a", "b"]
+        assert discovery._sorted_paths("me") is first
+
+        discovery.analyze_response({"c": 3}, "me")
+        assert discovery._sorted_paths("me") == ["a", "b", "c"]
+        assert discovery._sorted_paths() == ["a", "b", "c"]
+        assert discovery._sorted_paths("missing") == []
+
+
+class TestFieldInfo:
+    """Tests for FieldInfo sample sanitizing."""
+
+    def test_uses_slots(self):
+        """Test field records carry no per-instance __dict__."""
+        field = FieldInfo("p", "string", "x")
+        assert not hasattr(field, "__dict__")
+        with pytest.raises(AttributeError):
+            field.extra = 1
+
+    def test_masks_email(self):
+        """Test email samples are masked."""
+        assert FieldInfo("e", "email", "driver@example.com").to_dict()["sample"] == (
+            "dr***@example.com"
+        )
+
+    def test_masks_phone(self):
+        """Test phone number samples keep only the last four digits."""
+        assert FieldInfo("p", "string", "(512) 555-1234").to_dict()["sample"] == "***-***-1234"
+
+    def test_non_string_samples_unchanged(self):
+        """Test numbers and containers are returned as-is."""
+        assert FieldInfo._sanitize_sample(5551234567) == 5551234567
+        assert FieldInfo._sanitize_sample(["a@b.com"]) == ["a@b.com"]
+
+    def test_truncates_long_strings(self):
+        """Test long samples are truncated."""
+        sample = FieldInfo("s", "string", "x" * 60).to_dict()["sample"]
+        assert sample == "x" * 47 + "..."
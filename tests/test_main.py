@@ -2,21 +2,65 @@
 Tests for the main CLI module.
 """
 
+import logging
+import subprocess
 import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from hpde_analytics_cli.main import (
+    API_LOGGER_NAME,
+    VERBOSE_PREVIEW_CHARS,
+    configure_logging,
     create_parser,
+    fetch_api_data,
+    flush_logging,
+    get_parser,
     handle_credential_commands,
     load_environment,
 )
 
 
+class TestImports:
+    """Tests for module import cost."""
+
+    def test_command_modules_load_on_demand(self):
+        """Test importing main does not pull in export/report/Sheets modules."""
+        code = (
+            "import sys, hpde_analytics_cli.main; "
+            "print(any(m in sys.modules for m in ("
+            "'hpde_analytics_cli.utils.data_export', "
+            "'hpde_analytics_cli.utils.report_generator', "
+            "'hpde_analytics_cli.integrations.google_sheets', 'dotenv')))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
+
+    def test_http_stack_loads_on_demand(self):
+        """Test importing main does not pull in requests, OAuth or the callback server."""
+        code = (
+            "import sys, hpde_analytics_cli.main; "
+            "print(any(m in sys.modules for m in ("
+            "'requests', 'requests_oauthlib', 'oauthlib', 'http.server', "
+            "'hpde_analytics_cli.api.client')))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
+
+
 class TestCreateParser:
     """Tests for create_parser function."""
 
+    def test_get_parser_is_cached(self):
+        """Test that the shared parser is built once and reused."""
+        assert get_parser() is get_parser()
+        assert get_parser().prog == "hpde-analytics-cli"
+
     def test_parser_creation(self):
         """Test that parser is created successfully."""
         parser = create_parser()
@@ -53,6 +97,18 @@ class TestCreateParser:
         args = parser.parse_args(["--export"])
         assert args.export is True
 
+    def test_parser_feather_arg(self):
+        """Test --feather argument."""
+        parser = create_parser()
+        assert parser.parse_args(["--export", "--feather"]).feather is True
+        assert parser.parse_args(["--export"]).feather is False
+
+    def test_parser_compact_json_arg(self):
+        """Test --compact-json argument."""
+        parser = create_parser()
+        assert parser.parse_args(["--export", "--compact-json"]).compact_json is True
+        assert parser.parse_args(["--export"]).compact_json is False
+
     def test_parser_report_arg(self):
         """Test --report argument."""
         parser = create_parser()
@@ -211,7 +267,7 @@ class TestHandleCredentialCommands:
 class TestLoadEnvironment:
     """Tests for load_environment function."""
 
-    @patch("hpde_analytics_cli.main.load_dotenv")
+    @patch("dotenv.load_dotenv")
     @patch("hpde_analytics_cli.main.Path")
     def test_loads_env_when_exists(self, mock_path, mock_load_dotenv):
         """Test that .env is loaded when it exists."""
@@ -223,7 +279,7 @@ class TestLoadEnvironment:
 
         mock_load_dotenv.assert_called_once()
 
-    @patch("hpde_analytics_cli.main.load_dotenv")
+    @patch("dotenv.load_dotenv")
     def test_skips_when_no_env(self, mock_load_dotenv, tmp_path):
         """Test that loading completes without error when .env doesn't exist."""
         # The function checks if .env exists before calling load_dotenv
@@ -233,7 +289,7 @@ class TestLoadEnvironment:
         load_environment(verbose=False)
         # Function should complete without raising an error
 
-    @patch("hpde_analytics_cli.main.load_dotenv")
+    @patch("dotenv.load_dotenv")
     @patch("hpde_analytics_cli.main.Path")
     def test_verbose_output(self, mock_path, mock_load_dotenv, capsys):
         """Test verbose output when loading .env."""
@@ -247,6 +303,66 @@ class TestLoadEnvironment:
         assert "Loaded environment" in captured.out
 
 
+class TestConfigureLogging:
+    """Tests for configure_logging and flush_logging."""
+
+    @pytest.fixture(autouse=True)
+    def reset_logger(self):
+        """Remove handlers added to the API logger by each test."""
+        logger = logging.getLogger(API_LOGGER_NAME)
+        handlers, level, propagate = list(logger.handlers), logger.level, logger.propagate
+        logger.handlers = []
+        yield
+        logger.handlers = handlers
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+    def test_buffers_until_flushed(self, capsys):
+        """Test that progress messages are buffered and written on flush."""
+        configure_logging()
+        logger = logging.getLogger(API_LOGGER_NAME)
+        logger.handlers[0].target.stream = sys.stdout
+
+        logging.getLogger(f"{API_LOGGER_NAME}.client").info("  Fetching /rest/me...")
+        assert capsys.readouterr().out == ""
+
+        flush_logging()
+        assert capsys.readouterr().out == "  Fetching /rest/me...\n"
+
+    def test_is_idempotent(self):
+        """Test that repeated configuration does not add duplicate handlers."""
+        configure_logging()
+        configure_logging()
+
+        assert len(logging.getLogger(API_LOGGER_NAME).handlers) == 1
+
+
+class TestFetchApiData:
+    """Tests for fetch_api_data verbose output."""
+
+    def test_verbose_truncates_long_responses(self, capsys):
+        """Test long responses are cut off and marked as truncated."""
+        client = MagicMock()
+        client.get_all_endpoint_data.return_value = {"events": {"names": ["x" * 50] * 100}}
+
+        fetch_api_data(client, verbose=True)
+
+        out = capsys.readouterr().out
+        assert "... (truncated)" in out
+        assert len(out.split("[events]\n")[1]) < VERBOSE_PREVIEW_CHARS + 50
+
+    def test_verbose_short_response_not_truncated(self, capsys):
+        """Test short responses are printed in full without a marker."""
+        client = MagicMock()
+        client.get_all_endpoint_data.return_value = {"me": {"id": 1}}
+
+        fetch_api_data(client, verbose=True)
+
+        out = capsys.readouterr().out
+        assert '"id": 1' in out
+        assert "truncated" not in out
+
+
 class TestPopulateEmailsParser:
     """Tests for --populate-emails argument parsing."""
 
@@ -0,0 +1,344 @@
+"""
+Tests for the OAuth module.
+"""
+
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hpde_analytics_cli.auth.callback_server import OAuthCallbackHandler
+from hpde_analytics_cli.auth.oauth import (
+    CALLBACK_POLL_INTERVAL,
+    CALLBACK_TIMEOUT,
+    MSROAuth,
+    _exclusive_lock,
+)
+
+
+@pytest.fixture
+def oauth(tmp_path):
+    """MSROAuth instance with a token file in a temp directory."""
+    return MSROAuth("key", "secret", token_file=str(tmp_path / "access_token.json"))
+
+
+@pytest.fixture(autouse=True)
+def reset_handler():
+    """Reset the callback handler's class-level state around each test."""
+    OAuthCallbackHandler.oauth_verifier = None
+    OAuthCallbackHandler.oauth_token = None
+    OAuthCallbackHandler.callback_received = False
+    yield
+    OAuthCallbackHandler.oauth_verifier = None
+    OAuthCallbackHandler.oauth_token = None
+    OAuthCallbackHandler.callback_received = False
+
+
+def _make_handler(path):
+    """Build a callback handler for the given path without a real socket."""
+    handler = OAuthCallbackHandler.__new__(OAuthCallbackHandler)
+    handler.path = path
+    handler.send_response = MagicMock()
+    handler.send_header = MagicMock()
+    handler.end_headers = MagicMock()
+    handler.wfile = MagicMock()
+    return handler
+
+
+class TestOAuthCallbackHandler:
+    """Tests for OAuthCallbackHandler."""
+
+    def test_non_callback_path_returns_no_content(self):
+        """Test favicon/root requests get an empty 204 reply."""
+        handler = _make_handler("/favicon.ico")
+        handler.do_GET()
+
+        handler.send_response.assert_called_once_with(204)
+        handler.wfile.write.assert_not_called()
+        assert OAuthCallbackHandler.callback_received is False
+
+    def test_callback_path_records_verifier(self):
+        """Test the callback path captures the OAuth parameters."""
+        handler = _make_handler("/callback?oauth_token=tok&oauth_verifier=ver")
+        handler.do_GET()
+
+        handler.send_response.assert_called_once_with(200)
+        assert OAuthCallbackHandler.callback_received is True
+        assert OAuthCallbackHandler.oauth_verifier == "ver"
+        assert OAuthCallbackHandler.oauth_token == "tok"
+
+
+class TestWaitForCallback:
+    """Tests for MSROAuth._wait_for_callback."""
+
+    def test_handles_requests_until_callback(self, oauth):
+        """Test any number of stray requests can precede the callback."""
+        server = MagicMock()
+        requests_seen = []
+
+        def handle_request():
+            requests_seen.append(1)
+            if len(requests_seen) == 15:
+                OAuthCallbackHandler.oauth_verifier = "ver"
+                OAuthCallbackHandler.callback_received = True
+
+        server.handle_request.side_effect = handle_request
+
+        assert oauth._wait_for_callback(server) == "ver"
+        assert server.handle_request.call_count == 15
+
+    def test_callback_without_verifier_raises(self, oauth):
+        """Test a callback without a verifier stops waiting and raises."""
+        server = MagicMock()
+
+        def handle_request():
+            OAuthCallbackHandler.callback_received = True
+
+        server.handle_request.side_effect = handle_request
+
+        with pytest.raises(Exception) as exc_info:
+            oauth._wait_for_callback(server)
+
+        assert "No verification code" in str(exc_info.value)
+        assert server.handle_request.call_count == 1
+
+    @patch("hpde_analytics_cli.auth.oauth.time.monotonic")
+    def test_timeout_raises(self, mock_clock, oauth):
+        """Test waiting stops once the deadline passes."""
+        mock_clock.side_effect = [0.0, 9.8, 11.0]
+        server = MagicMock()
+
+        with pytest.raises(Exception):
+            oauth._wait_for_callback(server, timeout=10.0)
+
+        assert server.handle_request.call_count == 1
+        assert server.timeout == pytest.approx(0.2)
+
+    def test_polls_while_idle(self, oauth):
+        """Test the server wakes up regularly to check for a threaded callback."""
+        server = MagicMock()
+
+        def handle_request():
+            assert server.timeout <= CALLBACK_POLL_INTERVAL
+            OAuthCallbackHandler.oauth_verifier = "ver"
+            OAuthCallbackHandler.callback_received = True
+
+        server.handle_request.side_effect = handle_request
+
+        assert oauth._wait_for_callback(server) == "ver"
+
+
+class TestStartCallbackServer:
+    """Tests for MSROAuth._start_callback_server."""
+
+    def test_server_is_threaded(self, oauth):
+        """Test the callback server handles requests on daemon threads."""
+        oauth.callback_port = 0
+        server = oauth._start_callback_server()
+        try:
+            assert isinstance(server, ThreadingHTTPServer)
+            assert server.daemon_threads is True
+            assert server.timeout == CALLBACK_TIMEOUT
+        finally:
+            server.server_close()
+
+
+class TestLoadTokens:
+    """Tests for MSROAuth._load_tokens."""
+
+    def _write_tokens(self, path, **overrides):
+        data = {
+            "access_token": "tok",
+            "access_token_secret": "tok_secret",
+            "profile_id": "profile",
+            "organizations": [{"id": "org1"}],
+        }
+        data.update(overrides)
+        path.write_text(json.dumps(data))
+
+    def test_loads_tokens_from_file(self, tmp_path):
+        """Test tokens are read from an existing token file."""
+        token_file = tmp_path / "access_token.json"
+        self._write_tokens(token_file)
+
+        oauth = MSROAuth("key", "secret", token_file=str(token_file))
+
+        assert oauth.access_token == "tok"
+        assert oauth.access_token_secret == "tok_secret"
+        assert oauth.profile_id == "profile"
+        assert oauth.organizations == [{"id": "org1"}]
+
+    def test_missing_file(self, oauth):
+        """Test a missing token file leaves the instance unauthenticated."""
+        assert oauth.has_valid_tokens() is False
+
+    def test_invalid_json_warns(self, tmp_path, capsys):
+        """Test a corrupt token file is reported rather than raised."""
+        token_file = tmp_path / "access_token.json"
+        token_file.write_text("{not json")
+
+        oauth = MSROAuth("key", "secret", token_file=str(token_file))
+
+        assert oauth.has_valid_tokens() is False
+        assert "Could not load tokens" in capsys.readouterr().out
+
+    def test_unchanged_file_is_not_reparsed(self, tmp_path):
+        """Test a second instance reuses the parsed token file."""
+        token_file = tmp_path / "access_token.json"
+        self._write_tokens(token_file)
+        MSROAuth("key", "secret", token_file=str(token_file))
+
+        with patch("hpde_analytics_cli.auth.oauth._loads") as mock_loads:
+            oauth = MSROAuth("key", "secret", token_file=str(token_file))
+
+        mock_loads.assert_not_called()
+        assert oauth.access_token == "tok"
+
+    def test_saved_tokens_are_reloaded(self, tmp_path):
+        """Test saving tokens invalidates the cached copy."""
+        token_file = tmp_path / "access_token.json"
+        self._write_tokens(token_file)
+        oauth = MSROAuth("key", "secret", token_file=str(token_file))
+
+        oauth.access_token = "new_tok"
+        oauth._save_tokens()
+
+        assert MSROAuth("key", "secret", token_file=str(token_file)).access_token == "new_tok"
+
+
+class TestGetOAuthSession:
+    """Tests for MSROAuth.get_oauth_session."""
+
+    def test_requires_tokens(self, oauth):
+        """Test a session cannot be created without access tokens."""
+        with pytest.raises(Exception) as exc_info:
+            oauth.get_oauth_session()
+        assert "No valid access tokens" in str(exc_info.value)
+
+    def test_session_is_reused(self, oauth):
+        """Test the authenticated session is created once and reused."""
+        oauth.access_token = "tok"
+        oauth.access_token_secret = "tok_secret"
+
+        first = oauth.get_oauth_session()
+        assert oauth.get_oauth_session() is first
+        assert first.get_adapter("https://api.motorsportreg.com")._pool_maxsize == 16
+
+    def test_new_token_gets_new_session(self, oauth):
+        """Test a changed access token builds a fresh session."""
+        oauth.access_token = "tok"
+        oauth.access_token_secret = "tok_secret"
+        first = oauth.get_oauth_session()
+
+        oauth.access_token = "new_tok"
+        with patch.object(first, "close") as mock_close:
+            assert oauth.get_oauth_session() is not first
+        mock_close.assert_called_once()
+
+    def test_close_session(self, oauth):
+        """Test close_session closes the session and the next call builds a new one."""
+        oauth.access_token = "tok"
+        oauth.access_token_secret = "tok_secret"
+        first = oauth.get_oauth_session()
+
+        with patch.object(first, "close") as mock_close:
+            oauth.close_session()
+            oauth.close_session()
+        mock_close.assert_called_once()
+        assert oauth.get_oauth_session() is not first
+
+    def test_unauthorized_drops_session(self, oauth):
+        """Test a 401 from /rest/me discards the cached session."""
+        oauth.access_token = "tok"
+        oauth.access_token_secret = "tok_secret"
+        session = oauth.get_oauth_session()
+
+        with patch.object(session, "get") as mock_get:
+            mock_get.return_value = MagicMock(status_code=401)
+            with pytest.raises(Exception):
+                oauth.validate_connection()
+
+        assert oauth._session is None
+
+
+class TestSaveTokens:
+    """Tests for MSROAuth._save_tokens."""
+
+    def test_writes_token_file(self, oauth):
+        """Test tokens are written as JSON without leaving a temp file."""
+        oauth.access_token = "tok"
+        oauth.access_token_secret = "tok_secret"
+        oauth._save_tokens()
+
+        data = json.loads(oauth.token_file.read_text())
+        assert data["access_token"] == "tok"
+        assert data["access_token_secret"] == "tok_secret"
+        assert list(oauth.token_file.parent.iterdir()) == [oauth.token_file]
+
+    def test_skips_unchanged_file(self, oauth, capsys):
+        """Test saving identical tokens does not rewrite the file."""
+        oauth.access_token = "tok"
+        oauth.access_token_secret = "tok_secret"
+        oauth._save_tokens()
+        capsys.readouterr()
+
+        with patch("hpde_analytics_cli.auth.oauth.os.replace") as mock_replace:
+            oauth._save_tokens()
+
+        mock_replace.assert_not_called()
+        assert "saved" not in capsys.readouterr().out
+
+    def test_rewrites_changed_file(self, oauth):
+        """Test new organization data is written."""
+        oauth.access_token = "tok"
+        oauth.access_token_secret = "tok_secret"
+        oauth._save_tokens()
+
+        oauth.organizations = [{"id": "org1"}]
+        oauth._save_tokens()
+
+        assert json.loads(oauth.token_file.read_text())["organizations"] == [{"id": "org1"}]
+
+
+class TestRunAuthFlow:
+    """Tests for MSROAuth.run_auth_flow coordination."""
+
+    def test_reuses_tokens_written_by_another_process(self, oauth):
+        """Test tokens saved while waiting for the lock skip the browser flow."""
+        other = MSROAuth("key", "secret", token_file=str(oauth.token_file))
+        other.access_token = "tok"
+        other.access_token_secret = "tok_secret"
+        other._save_tokens()
+
+        with (
+            patch.object(oauth, "validate_connection", return_value={"id": "me"}),
+            patch.object(oauth, "_start_callback_server") as mock_server,
+        ):
+            assert oauth.run_auth_flow(auto_open_browser=False) == {"id": "me"}
+
+        mock_server.assert_not_called()
+        assert oauth.access_token == "tok"
+
+    def test_flow_holds_lock(self, oauth):
+        """Test the flow body runs while the token lock is held."""
+        lock_path = oauth.token_file.with_name(oauth.token_file.name + ".lock")
+        acquired = threading.Event()
+
+        def flow(auto_open_browser):
+            def try_lock():
+                with _exclusive_lock(lock_path):
+                    acquired.set()
+
+            waiter = threading.Thread(target=try_lock)
+            waiter.start()
+            held = not acquired.wait(0.2)
+            return held, waiter
+
+        with patch.object(oauth, "_run_locked_auth_flow", side_effect=flow):
+            held, waiter = oauth.run_auth_flow()
+
+        waiter.join(timeout=5)
+        assert held is True
+        assert acquired.is_set()
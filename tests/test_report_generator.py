@@ -11,6 +11,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from hpde_analytics_cli.utils.report_generator import (
+    DriverRecord,
     ReportGenerator,
     generate_report,
 )
@@ -199,6 +200,34 @@ class TestReportGenerator:
         assert generator.entrylist_file.endswith("entrylist.csv")
         assert generator.attendees_file.endswith("attendees.csv")
 
+    def test_iter_csv_reads_report_columns(self, temp_export_dir):
+        """Test CSV rows stream as stripped, keyed records with missing cells empty."""
+        path = os.path.join(temp_export_dir, "sample.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            f.write("firstName,lastName,class,extra\r\n")
+            f.write(" John , Doe,Sport 1 ,x\r\n")
+            f.write("\r\n")
+            f.write("Jane\r\n")
+            f.write("Bob,Jones,Tuner 3,y,overflow\r\n")
+
+        records = list(ReportGenerator(temp_export_dir)._iter_csv(path))
+
+        assert [(r.firstName, r.lastName, r.tt_class) for r in records] == [
+            ("John", "Doe", "Sport 1"),
+            ("Jane", "", ""),
+            ("Bob", "Jones", "Tuner 3"),
+        ]
+        assert [r.key for r in records] == ["john|doe", "jane|", "bob|jones"]
+        assert records[0].segment == ""
+        assert records[0].email == ""
+
+    def test_iter_csv_empty_file(self, temp_export_dir):
+        """Test an empty CSV yields no records."""
+        path = os.path.join(temp_export_dir, "empty.csv")
+        open(path, "w").close()
+
+        assert list(ReportGenerator(temp_export_dir)._iter_csv(path)) == []
+
     def test_get_driver_key(self, temp_export_dir):
         """Test driver key generation."""
         generator = ReportGenerator(temp_export_dir)
@@ -210,6 +239,36 @@ class TestReportGenerator:
         key = generator._get_driver_key({"firstName": "", "lastName": "Doe"})
         assert key == "|doe"
 
+    def test_repeated_values_are_cached(self, temp_export_dir):
+        """Test classifying a repeated value reuses the cached result."""
+        generator = ReportGenerator(temp_export_dir)
+        generator._is_time_trials("Time Trials - Cached")
+        hits = ReportGenerator._classify_group.cache_info().hits
+
+        assert generator._is_time_trials("Time Trials - Cached") is True
+        assert ReportGenerator._classify_group.cache_info().hits == hits + 1
+
+    def test_classify_group(self, temp_export_dir):
+        """Test one classification pass reports every participation type."""
+        generator = ReportGenerator(temp_export_dir)
+
+        assert generator._classify_group("Time Trials - Sport 1") == 1
+        assert generator._classify_group("Instructing") == 2
+        assert generator._classify_group("Advanced HPDE") == 4
+        assert generator._classify_group("Instructing / Advanced HPDE") == 6
+        assert generator._classify_group("Novice HPDE") == 0
+        assert generator._classify_group(None) == 0
+
+    def test_classify_segment(self, temp_export_dir):
+        """Test segments classify as worker-only and by day together."""
+        generator = ReportGenerator(temp_export_dir)
+
+        assert generator._classify_segment("Friday Time Trials") == (False, 1)
+        assert generator._classify_segment("Saturday Workers") == (True, 2)
+        assert generator._classify_segment("Sunday HPDE") == (False, 4)
+        assert generator._classify_segment("Test Day") == (False, 0)
+        assert generator._classify_segment("") == (True, 0)
+
     def test_parse_segment_friday(self, temp_export_dir):
         """Test parsing Friday segment."""
         generator = ReportGenerator(temp_export_dir)
@@ -261,6 +320,74 @@ class TestReportGenerator:
         assert generator._is_worker_only("") is True
         assert generator._is_worker_only(None) is True
 
+    def test_driver_record_defaults(self):
+        """Test driver records start empty and carry no per-instance __dict__."""
+        driver = DriverRecord("John", "Doe")
+
+        assert (driver.firstName, driver.lastName, driver.tt_class) == ("John", "Doe", "")
+        assert driver.is_tt is False
+        assert driver.days_tt_mask == 0
+        assert not hasattr(driver, "__dict__")
+
+    def test_apply_tire_brands_matches_tt_assignments(self, temp_export_dir):
+        """Test tire brands come only from Time Trials assignments of known drivers."""
+        with open(os.path.join(temp_export_dir, "assignments.json"), "w") as f:
+            json.dump(
+                {
+                    "assignments": [
+                        {"firstName": "John", "lastName": "Doe", "group": "Time Trials"},
+                        {
+                            "firstName": "John",
+                            "lastName": "Doe",
+                            "group": "HPDE 3",
+                            "tireBrand": "X",
+                        },
+                        {"firstName": "Jane", "lastName": "Smith", "tireBrand": "Hoosier"},
+                        {
+                            "firstName": "Ann",
+                            "lastName": "Lee",
+                            "group": "Time Trials",
+                            "tireBrand": "Y",
+                        },
+                        {
+                            "firstName": " JOHN",
+                            "lastName": "doe",
+                            "group": "Time Trials",
+                            "tireBrand": "Z",
+                        },
+                    ]
+                },
+                f,
+            )
+        drivers = {
+            "john|doe": DriverRecord("John", "Doe"),
+            "jane|smith": DriverRecord("Jane", "Smith"),
+        }
+
+        generator = ReportGenerator(temp_export_dir)
+        generator._apply_tire_brands(drivers, generator._load_assignments())
+
+        assert drivers["john|doe"].tireBrand == "Z"
+        assert drivers["jane|smith"].tireBrand == ""
+
+    def test_load_assignments_without_export(self, temp_export_dir):
+        """Test a missing assignments export yields no assignments."""
+        generator = ReportGenerator(temp_export_dir)
+        os.remove(generator.assignments_json_file)
+
+        assert generator._load_assignments() == []
+
+    def test_read_json_parses_bytes(self, temp_export_dir):
+        """Test JSON files are read as bytes and handed to the fast parser."""
+        generator = ReportGenerator(temp_export_dir)
+
+        with patch(
+            "hpde_analytics_cli.utils.report_generator._loads", return_value={"ok": 1}
+        ) as mock_loads:
+            assert generator._read_json(generator.assignments_json_file) == {"ok": 1}
+
+        assert isinstance(mock_loads.call_args.args[0], bytes)
+
     def test_get_participation_type(self, temp_export_dir):
         """Test participation type categorization."""
         generator = ReportGenerator(temp_export_dir)
@@ -279,6 +406,34 @@ class TestReportGenerator:
         assert generator._get_day_count(3) == "3 Days"
         assert generator._get_day_count(0) == ""
 
+    @pytest.mark.parametrize(
+        "days, expected",
+        [
+            (0, ("", 0)),
+            (1, ("Friday", 1)),
+            (2, ("Saturday", 1)),
+            (4, ("Sunday", 1)),
+            (1 | 2, ("Fri/Sat", 2)),
+            (1 | 4, ("Fri/Sun", 2)),
+            (2 | 4, ("Sat/Sun", 2)),
+            (1 | 2 | 4, ("All 3", 3)),
+        ],
+    )
+    def test_format_days_string(self, temp_export_dir, days, expected):
+        """Test every combination of days formats with its count."""
+        generator = ReportGenerator(temp_export_dir)
+        assert generator._format_days_string(days) == expected
+
+    def test_format_vehicle_string_skips_empty_parts(self, temp_export_dir):
+        """Test the vehicle string joins only the parts that are present."""
+        generator = ReportGenerator(temp_export_dir)
+        driver = DriverRecord("John", "Doe")
+        driver.year, driver.model = "2020", "MX-5"
+
+        assert generator._format_vehicle_string(driver) == "2020 MX-5"
+        driver.year = driver.model = ""
+        assert generator._format_vehicle_string(driver) == ""
+
     def test_get_class_group(self, temp_export_dir):
         """Test class group categorization."""
         generator = ReportGenerator(temp_export_dir)
@@ -308,6 +463,82 @@ class TestReportGenerator:
         # Verify driver count (3 TT participants, worker excluded)
         assert driver_count == 3
 
+    def test_generate_tt_report_contents(self, temp_export_dir):
+        """Test the report rows merge entry, attendee, and tire data."""
+        from openpyxl import load_workbook
+
+        generator = ReportGenerator(temp_export_dir)
+        output_path = os.path.join(temp_export_dir, "test_report.xlsx")
+        generator.generate_tt_report(output_path)
+
+        ws = load_workbook(output_path)["Time Trials Report"]
+        rows = list(ws.iter_rows(values_only=True))
+
+        assert rows[0][:3] == ("First Name", "Last Name", "Email")
+        assert rows[1:] == [
+            (
+                "John",
+                "Doe",
+                "john@example.com",
+                "M001",
+                "Sport 1",
+                "Sport",
+                "42",
+                "2020 Mazda MX-5",
+                "Red",
+                "Hoosier",
+                "ACME Racing",
+                "Sat/Sun",
+                "2 Days",
+                "No",
+                "No",
+                "TT Only",
+                "Confirmed",
+            ),
+            (
+                "Bob",
+                "Jones",
+                "bob@example.com",
+                "M003",
+                "Tuner 3",
+                "Tuner",
+                "7",
+                "2018 Honda Civic",
+                "Blue",
+                "BFGoodrich",
+                None,
+                "Saturday",
+                "1 Day",
+                "Yes",
+                "No",
+                "TT + Instructor",
+                "Pending",
+            ),
+            (
+                "Jane",
+                "Smith",
+                "jane@example.com",
+                "M002",
+                "Max 2",
+                "Max",
+                "99",
+                "2019 Porsche 911",
+                "White",
+                "Michelin",
+                None,
+                "Saturday",
+                "1 Day",
+                "No",
+                "Yes",
+                "TT + AYCE",
+                "Confirmed",
+            ),
+        ]
+        assert ws.freeze_panes == "A2"
+        assert ws.column_dimensions["A"].width == 12
+        assert ws.column_dimensions["C"].width == 18
+        assert ws.column_dimensions["H"].width == 18
+
     def test_generate_tt_report_excludes_workers(self, temp_export_dir):
         """Test that worker-only entries are excluded from report."""
         generator = ReportGenerator(temp_export_dir)
@@ -328,6 +559,43 @@ class TestReportGenerator:
         # John Doe appears twice but should be counted once
         assert driver_count == 3
 
+    def test_generate_tt_report_skips_repeated_rows(self, temp_export_dir):
+        """Test an entry row repeated back to back in the export is processed once."""
+        generator = ReportGenerator(temp_export_dir)
+        with open(generator.entrylist_file, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        with open(generator.entrylist_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines[:2] + lines[1:]) + "\n")
+
+        with patch.object(
+            generator, "_process_entry", wraps=generator._process_entry
+        ) as mock_process:
+            _, driver_count = generator.generate_tt_report(
+                os.path.join(temp_export_dir, "test_report.xlsx")
+            )
+
+        assert mock_process.call_count == len(lines) - 1
+        assert driver_count == 3
+
+    def test_generate_tt_report_last_interleaved_row_wins(self, temp_export_dir):
+        """Test a row repeated after other rows still overrides the vehicle in between."""
+        from openpyxl import load_workbook
+
+        generator = ReportGenerator(temp_export_dir)
+        with open(generator.entrylist_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["firstName", "lastName", "segment", "group", "make", "model", "color"])
+            friday = ["Ann", "Lee", "Friday TT", "Time Trials", "Honda", "S2000", "Red"]
+            writer.writerow(friday)
+            writer.writerow(["Ann", "Lee", "Saturday TT", "Time Trials", "Mazda", "Miata", "Blue"])
+            writer.writerow(friday)
+        output_path = os.path.join(temp_export_dir, "test_report.xlsx")
+
+        generator.generate_tt_report(output_path)
+
+        row = list(load_workbook(output_path).active.iter_rows(min_row=2, values_only=True))[0]
+        assert (row[7], row[8], row[11]) == ("Honda S2000", "Red", "Fri/Sat")
+
     def test_generate_tt_report_default_output_path(self, temp_export_dir):
         """Test report generation with default output path."""
         generator = ReportGenerator(temp_export_dir)